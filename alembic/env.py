@@ -9,7 +9,9 @@ from alembic import context
 
 # ── Import our app config & models so Alembic knows the target schema ──
 from app.core.config import settings
-from app.models import Base  # noqa: F401 — triggers all model registrations
+from app.models import Base, register_all
+
+register_all()
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
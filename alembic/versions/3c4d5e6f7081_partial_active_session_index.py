@@ -0,0 +1,55 @@
+"""partial index on active user sessions
+
+Revision ID: 3c4d5e6f7081
+Revises: 2b3c4d5e6f70
+Create Date: 2026-03-08 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c4d5e6f7081"
+down_revision: Union[str, Sequence[str], None] = "2b3c4d5e6f70"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _indexes(table_name: str) -> set[str]:
+    return {idx["name"] for idx in sa.inspect(op.get_bind()).get_indexes(table_name)}
+
+
+def upgrade() -> None:
+    """Replace the full is_active indexes with one partial index on active rows."""
+    existing = _indexes("user_sessions")
+
+    if "ix_user_sessions_active" not in existing:
+        op.create_index(
+            "ix_user_sessions_active",
+            "user_sessions",
+            ["user_id"],
+            postgresql_where=sa.text("is_active"),
+        )
+    if "ix_user_sessions_user_active" in existing:
+        op.drop_index("ix_user_sessions_user_active", table_name="user_sessions")
+    if "ix_user_sessions_is_active" in existing:
+        op.drop_index("ix_user_sessions_is_active", table_name="user_sessions")
+
+
+def downgrade() -> None:
+    """Restore the full-table is_active indexes."""
+    existing = _indexes("user_sessions")
+
+    if "ix_user_sessions_is_active" not in existing:
+        op.create_index("ix_user_sessions_is_active", "user_sessions", ["is_active"])
+    if "ix_user_sessions_user_active" not in existing:
+        op.create_index(
+            "ix_user_sessions_user_active",
+            "user_sessions",
+            ["user_id", "is_active"],
+        )
+    if "ix_user_sessions_active" in existing:
+        op.drop_index("ix_user_sessions_active", table_name="user_sessions")
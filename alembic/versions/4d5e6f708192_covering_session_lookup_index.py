@@ -0,0 +1,40 @@
+"""covering index for session validation lookup
+
+Revision ID: 4d5e6f708192
+Revises: 3c4d5e6f7081
+Create Date: 2026-03-08 00:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4d5e6f708192"
+down_revision: Union[str, Sequence[str], None] = "3c4d5e6f7081"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _indexes(table_name: str) -> set[str]:
+    return {idx["name"] for idx in sa.inspect(op.get_bind()).get_indexes(table_name)}
+
+
+def upgrade() -> None:
+    """Add an index-only path for the per-request session lookup."""
+    if "ix_user_sessions_lookup" not in _indexes("user_sessions"):
+        op.create_index(
+            "ix_user_sessions_lookup",
+            "user_sessions",
+            ["id"],
+            postgresql_include=["user_id", "device_id", "last_seen_at"],
+            postgresql_where=sa.text("is_active"),
+        )
+
+
+def downgrade() -> None:
+    """Drop the covering session lookup index."""
+    if "ix_user_sessions_lookup" in _indexes("user_sessions"):
+        op.drop_index("ix_user_sessions_lookup", table_name="user_sessions")
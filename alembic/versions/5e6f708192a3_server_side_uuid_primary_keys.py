@@ -0,0 +1,73 @@
+"""generate uuid primary keys server-side
+
+Revision ID: 5e6f708192a3
+Revises: 4d5e6f708192
+Create Date: 2026-03-08 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e6f708192a3"
+down_revision: Union[str, Sequence[str], None] = "4d5e6f708192"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Every table with a UUID `id` primary key.
+_TABLES = (
+    "users",
+    "roles",
+    "permissions",
+    "warehouses",
+    "clients",
+    "invitations",
+    "user_sessions",
+    "password_reset_otps",
+    "skus",
+    "inventory_ledger",
+    "audit_log",
+    "rooms",
+    "racks",
+    "rack_allocations",
+    "temperature_zones",
+)
+
+
+def _existing_tables() -> set[str]:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    """Default every UUID primary key to gen_random_uuid()."""
+    # gen_random_uuid() is built in from PostgreSQL 13; pgcrypto provides
+    # it on older servers.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+    existing = _existing_tables()
+    for table in _TABLES:
+        if table in existing:
+            op.alter_column(
+                table,
+                "id",
+                existing_type=sa.Uuid(),
+                server_default=sa.text("gen_random_uuid()"),
+                existing_nullable=False,
+            )
+
+
+def downgrade() -> None:
+    """Drop the server-side UUID defaults (the extension is left in place)."""
+    existing = _existing_tables()
+    for table in _TABLES:
+        if table in existing:
+            op.alter_column(
+                table,
+                "id",
+                existing_type=sa.Uuid(),
+                server_default=None,
+                existing_nullable=False,
+            )
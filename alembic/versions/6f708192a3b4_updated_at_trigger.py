@@ -0,0 +1,71 @@
+"""maintain updated_at with a trigger
+
+Revision ID: 6f708192a3b4
+Revises: 5e6f708192a3
+Create Date: 2026-03-08 01:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6f708192a3b4"
+down_revision: Union[str, Sequence[str], None] = "5e6f708192a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Every table built on TimestampMixin.
+_TABLES = (
+    "users",
+    "roles",
+    "permissions",
+    "warehouses",
+    "operator_profiles",
+    "clients",
+    "invitations",
+    "skus",
+    "rooms",
+    "racks",
+    "rack_allocations",
+    "temperature_zones",
+)
+
+
+def _existing_tables() -> set[str]:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    """Bump updated_at on every UPDATE, including Core statements."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.updated_at := now();
+            RETURN NEW;
+        END;
+        $$
+        """
+    )
+    existing = _existing_tables()
+    for table in _TABLES:
+        if table in existing:
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_updated_at ON {table}")
+            op.execute(
+                f"CREATE TRIGGER trg_{table}_updated_at BEFORE UPDATE ON {table} "
+                "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+            )
+
+
+def downgrade() -> None:
+    """Drop the updated_at triggers and their function."""
+    existing = _existing_tables()
+    for table in _TABLES:
+        if table in existing:
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_updated_at ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
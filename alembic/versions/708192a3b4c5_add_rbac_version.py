@@ -0,0 +1,40 @@
+"""add rbac_version counter
+
+Revision ID: 708192a3b4c5
+Revises: 6f708192a3b4
+Create Date: 2026-03-08 02:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "708192a3b4c5"
+down_revision: Union[str, Sequence[str], None] = "6f708192a3b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _tables() -> set[str]:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    """Create the single-row RBAC version counter."""
+    if "rbac_version" not in _tables():
+        op.create_table(
+            "rbac_version",
+            sa.Column("id", sa.SmallInteger(), nullable=False),
+            sa.Column("version", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    op.execute("INSERT INTO rbac_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING")
+
+
+def downgrade() -> None:
+    """Drop the RBAC version counter."""
+    if "rbac_version" in _tables():
+        op.drop_table("rbac_version")
@@ -0,0 +1,38 @@
+"""reverse-direction indexes on role association tables
+
+Revision ID: 8192a3b4c5d6
+Revises: 708192a3b4c5
+Create Date: 2026-03-08 02:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8192a3b4c5d6"
+down_revision: Union[str, Sequence[str], None] = "708192a3b4c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _indexes(table_name: str) -> set[str]:
+    return {idx["name"] for idx in sa.inspect(op.get_bind()).get_indexes(table_name)}
+
+
+def upgrade() -> None:
+    """Index the second PK column of each association table."""
+    if "ix_user_roles_role" not in _indexes("user_roles"):
+        op.create_index("ix_user_roles_role", "user_roles", ["role_id"])
+    if "ix_role_permissions_perm" not in _indexes("role_permissions"):
+        op.create_index("ix_role_permissions_perm", "role_permissions", ["permission_id"])
+
+
+def downgrade() -> None:
+    """Drop the reverse-direction association indexes."""
+    if "ix_role_permissions_perm" in _indexes("role_permissions"):
+        op.drop_index("ix_role_permissions_perm", table_name="role_permissions")
+    if "ix_user_roles_role" in _indexes("user_roles"):
+        op.drop_index("ix_user_roles_role", table_name="user_roles")
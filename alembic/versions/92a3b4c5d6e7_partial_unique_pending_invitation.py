@@ -0,0 +1,60 @@
+"""one pending invitation per email
+
+Revision ID: 92a3b4c5d6e7
+Revises: 8192a3b4c5d6
+Create Date: 2026-03-08 03:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "92a3b4c5d6e7"
+down_revision: Union[str, Sequence[str], None] = "8192a3b4c5d6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _indexes(table_name: str) -> set[str]:
+    return {idx["name"] for idx in sa.inspect(op.get_bind()).get_indexes(table_name)}
+
+
+def upgrade() -> None:
+    """Replace the plain email index with a partial unique one."""
+    # Older rows may hold several PENDING invites for one email; keep
+    # the newest and expire the rest so the unique index can build.
+    op.execute(
+        """
+        UPDATE invitations SET status = 'EXPIRED'
+        WHERE status = 'PENDING'
+          AND id NOT IN (
+              SELECT DISTINCT ON (email) id
+              FROM invitations
+              WHERE status = 'PENDING'
+              ORDER BY email, created_at DESC
+          )
+        """
+    )
+    indexes = _indexes("invitations")
+    if "ix_invitations_email_pending" not in indexes:
+        op.create_index(
+            "ix_invitations_email_pending",
+            "invitations",
+            ["email"],
+            unique=True,
+            postgresql_where=sa.text("status = 'PENDING'"),
+        )
+    if "ix_invitations_email" in indexes:
+        op.drop_index("ix_invitations_email", table_name="invitations")
+
+
+def downgrade() -> None:
+    """Restore the plain email index."""
+    indexes = _indexes("invitations")
+    if "ix_invitations_email" not in indexes:
+        op.create_index("ix_invitations_email", "invitations", ["email"])
+    if "ix_invitations_email_pending" in indexes:
+        op.drop_index("ix_invitations_email_pending", table_name="invitations")
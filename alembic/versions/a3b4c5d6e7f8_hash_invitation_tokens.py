@@ -0,0 +1,54 @@
+"""store invitation tokens as sha-256 digests
+
+Revision ID: a3b4c5d6e7f8
+Revises: 92a3b4c5d6e7
+Create Date: 2026-03-08 03:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3b4c5d6e7f8"
+down_revision: Union[str, Sequence[str], None] = "92a3b4c5d6e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(table_name: str) -> set[str]:
+    return {col["name"] for col in sa.inspect(op.get_bind()).get_columns(table_name)}
+
+
+def _unique_constraints(table_name: str) -> set[str]:
+    return {uc["name"] for uc in sa.inspect(op.get_bind()).get_unique_constraints(table_name)}
+
+
+def upgrade() -> None:
+    """Replace invitations.token with a 32-byte token_hash."""
+    columns = _columns("invitations")
+    if "token_hash" not in columns:
+        op.add_column("invitations", sa.Column("token_hash", sa.LargeBinary(length=32), nullable=True))
+    if "token" in columns:
+        # Digest the outstanding plaintext tokens so existing links keep working.
+        op.execute("UPDATE invitations SET token_hash = sha256(convert_to(token, 'UTF8'))")
+        op.drop_column("invitations", "token")
+    op.alter_column("invitations", "token_hash", nullable=False)
+    if "invitations_token_hash_key" not in _unique_constraints("invitations"):
+        op.create_unique_constraint("invitations_token_hash_key", "invitations", ["token_hash"])
+
+
+def downgrade() -> None:
+    """Restore the plaintext token column.
+
+    Digests can't be reversed: every invitation gets a fresh random token,
+    so links already sent stop working.
+    """
+    op.drop_constraint("invitations_token_hash_key", "invitations", type_="unique")
+    op.add_column("invitations", sa.Column("token", sa.String(length=512), nullable=True))
+    op.execute("UPDATE invitations SET token = encode(gen_random_bytes(36), 'base64')")
+    op.alter_column("invitations", "token", nullable=False)
+    op.create_unique_constraint("invitations_token_key", "invitations", ["token"])
+    op.drop_column("invitations", "token_hash")
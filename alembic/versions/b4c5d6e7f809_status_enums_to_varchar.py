@@ -0,0 +1,83 @@
+"""store user / invitation status as varchar + check
+
+Revision ID: b4c5d6e7f809
+Revises: a3b4c5d6e7f8
+Create Date: 2026-03-08 04:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b4c5d6e7f809"
+down_revision: Union[str, Sequence[str], None] = "a3b4c5d6e7f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table, check constraint, enum type, values, default
+_STATUSES = (
+    ("users", "ck_users_status", "user_status", ("INVITED", "ACTIVE", "DISABLED"), "INVITED"),
+    ("invitations", "ck_invitations_status", "invitation_status", ("PENDING", "ACCEPTED", "EXPIRED"), "PENDING"),
+)
+
+_PENDING_INDEX = "ix_invitations_email_pending"
+
+
+def _indexes(table_name: str) -> set[str]:
+    return {idx["name"] for idx in sa.inspect(op.get_bind()).get_indexes(table_name)}
+
+
+def _drop_pending_index() -> None:
+    # Its predicate compares `status` to a literal of the column's type,
+    # so it has to be rebuilt around the type change.
+    if _PENDING_INDEX in _indexes("invitations"):
+        op.drop_index(_PENDING_INDEX, table_name="invitations")
+
+
+def _create_pending_index() -> None:
+    op.create_index(
+        _PENDING_INDEX,
+        "invitations",
+        ["email"],
+        unique=True,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def upgrade() -> None:
+    """Convert the status enums to VARCHAR(16) with CHECK constraints."""
+    _drop_pending_index()
+    for table, check, enum_type, values, default in _STATUSES:
+        op.alter_column(
+            table,
+            "status",
+            type_=sa.String(length=16),
+            postgresql_using="status::text",
+            existing_nullable=False,
+        )
+        op.alter_column(table, "status", server_default=default)
+        allowed = ", ".join(f"'{value}'" for value in values)
+        op.create_check_constraint(check, table, f"status IN ({allowed})")
+        op.execute(f"DROP TYPE IF EXISTS {enum_type}")
+    _create_pending_index()
+
+
+def downgrade() -> None:
+    """Restore the PostgreSQL enum types."""
+    _drop_pending_index()
+    for table, check, enum_type, values, _default in _STATUSES:
+        op.drop_constraint(check, table, type_="check")
+        op.alter_column(table, "status", server_default=None)
+        sa.Enum(*values, name=enum_type).create(op.get_bind(), checkfirst=True)
+        op.alter_column(
+            table,
+            "status",
+            type_=sa.Enum(*values, name=enum_type),
+            postgresql_using=f"status::{enum_type}",
+            existing_nullable=False,
+        )
+    _create_pending_index()
@@ -0,0 +1,34 @@
+"""record the applied permission seed hash
+
+Revision ID: c5d6e7f8091a
+Revises: b4c5d6e7f809
+Create Date: 2026-03-08 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d6e7f8091a"
+down_revision: Union[str, Sequence[str], None] = "b4c5d6e7f809"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns() -> set[str]:
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns("rbac_version")}
+
+
+def upgrade() -> None:
+    """Add rbac_version.seed_hash so an unchanged seed can be skipped."""
+    if "seed_hash" not in _columns():
+        op.add_column("rbac_version", sa.Column("seed_hash", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop rbac_version.seed_hash."""
+    if "seed_hash" in _columns():
+        op.drop_column("rbac_version", "seed_hash")
@@ -0,0 +1,42 @@
+"""covering unique index for the login email lookup
+
+Revision ID: d6e7f8091a2b
+Revises: c5d6e7f8091a
+Create Date: 2026-03-08 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d6e7f8091a2b"
+down_revision: Union[str, Sequence[str], None] = "c5d6e7f8091a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _indexes(table_name: str) -> set[str]:
+    return {idx["name"] for idx in sa.inspect(op.get_bind()).get_indexes(table_name)}
+
+
+def upgrade() -> None:
+    """Rebuild ix_users_email with the columns login reads as INCLUDE."""
+    if "ix_users_email" in _indexes("users"):
+        op.drop_index("ix_users_email", table_name="users")
+    op.create_index(
+        "ix_users_email",
+        "users",
+        ["email"],
+        unique=True,
+        postgresql_include=["id", "password_hash", "status"],
+    )
+
+
+def downgrade() -> None:
+    """Restore the plain unique email index."""
+    if "ix_users_email" in _indexes("users"):
+        op.drop_index("ix_users_email", table_name="users")
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
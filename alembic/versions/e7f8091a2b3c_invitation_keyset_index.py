@@ -0,0 +1,40 @@
+"""index invitations and users by (created_at, id) for keyset pagination
+
+Revision ID: e7f8091a2b3c
+Revises: d6e7f8091a2b
+Create Date: 2026-03-08 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7f8091a2b3c"
+down_revision: Union[str, Sequence[str], None] = "d6e7f8091a2b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _indexes(table_name: str) -> set[str]:
+    return {idx["name"] for idx in sa.inspect(op.get_bind()).get_indexes(table_name)}
+
+
+def upgrade() -> None:
+    """Add the (created_at, id) indexes behind the paginated admin listings."""
+    if "ix_invitations_created" not in _indexes("invitations"):
+        op.create_index(
+            "ix_invitations_created", "invitations", ["created_at", "id"]
+        )
+    if "ix_users_created" not in _indexes("users"):
+        op.create_index("ix_users_created", "users", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    """Drop the keyset pagination indexes."""
+    if "ix_users_created" in _indexes("users"):
+        op.drop_index("ix_users_created", table_name="users")
+    if "ix_invitations_created" in _indexes("invitations"):
+        op.drop_index("ix_invitations_created", table_name="invitations")
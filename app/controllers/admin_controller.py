@@ -11,14 +11,15 @@ Architecture note:
 """
 
 import uuid
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.models.user import User
-from app.rbac.context_resolver import DataScope, resolve_data_scope
-from app.rbac.dependencies import require_permission
+from app.rbac.context_resolver import DataScope
+from app.rbac.dependencies import get_data_scope, require_permission
 from app.schemas import (
     CreateInvitationRequest,
     CreateRackRequest,
@@ -40,6 +41,43 @@ from app.services import room_service, rack_service, temperature_zone_service
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
+# List endpoints return ORM rows as-is: FastAPI validates them against
+# the route's response_model (a TypeAdapter compiled once per route,
+# from_attributes=True) and serialises straight to JSON bytes in
+# pydantic-core.  Building models here first would only add a pass.
+
+
+# ── Keyset pagination ────────────────────────────────────────────────
+# Users, warehouses and invitations are listed newest first by
+# ``(created_at, id)``.  A full page carries a ``Link: <…>; rel="next"``
+# header whose URL holds the cursor for the following page; ``skip``
+# still works for clients that don't follow it.
+
+
+def keyset_cursor(
+    after_created_at: datetime | None = Query(None),
+    after_id: uuid.UUID | None = Query(None),
+) -> tuple[datetime, uuid.UUID] | None:
+    """
+    Optional keyset cursor — the ``created_at`` and ``id`` of the last
+    item on the previous page.  When both are given, ``skip`` is ignored.
+    """
+    if after_created_at is None or after_id is None:
+        return None
+    return after_created_at, after_id
+
+
+def _link_next_page(request: Request, response: Response, rows: list, limit: int) -> None:
+    """Set the ``rel="next"`` Link header when ``rows`` filled the page."""
+    if len(rows) < limit:
+        return
+    last = rows[-1]
+    next_url = request.url.remove_query_params("skip").include_query_params(
+        after_created_at=last.created_at.isoformat(),
+        after_id=str(last.id),
+    )
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+
 
 # ── Warehouses ───────────────────────────────────────────────────────
 @router.post("/warehouses", response_model=WarehouseOut, status_code=201)
@@ -61,14 +99,18 @@ async def create_warehouse(
 
 @router.get("/warehouses", response_model=list[WarehouseOut])
 async def list_warehouses(
+    request: Request,
+    response: Response,
     user: User = Depends(require_permission("warehouse.create")),
+    scope: DataScope = Depends(get_data_scope),
     db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    after: tuple[datetime, uuid.UUID] | None = Depends(keyset_cursor),
 ):
-    scope = await resolve_data_scope(user, db)
-    warehouses = await warehouse_service.list_warehouses(db, scope, skip, limit)
-    return [WarehouseOut.model_validate(w) for w in warehouses]
+    rows = await warehouse_service.list_warehouses(db, scope, skip, limit, after)
+    _link_next_page(request, response, rows, limit)
+    return rows
 
 
 @router.patch("/warehouses/{warehouse_id}", response_model=WarehouseOut)
@@ -76,9 +118,9 @@ async def update_warehouse(
     warehouse_id: uuid.UUID,
     body: UpdateWarehouseRequest,
     user: User = Depends(require_permission("warehouse.update")),
+    scope: DataScope = Depends(get_data_scope),
     db: AsyncSession = Depends(get_db),
 ):
-    scope = await resolve_data_scope(user, db)
     wh = await warehouse_service.update_warehouse(
         warehouse_id=warehouse_id,
         db=db,
@@ -93,26 +135,18 @@ async def update_warehouse(
 # ── Users ────────────────────────────────────────────────────────────
 @router.get("/users", response_model=list[UserOut])
 async def list_users(
+    request: Request,
+    response: Response,
     user: User = Depends(require_permission("user.invite.operator")),
+    scope: DataScope = Depends(get_data_scope),
     db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    after: tuple[datetime, uuid.UUID] | None = Depends(keyset_cursor),
 ):
-    scope = await resolve_data_scope(user, db)
-    users = await user_service.list_users(db, scope, skip, limit)
-    return [
-        UserOut(
-            id=u.id,
-            email=u.email,
-            full_name=u.full_name,
-            phone=u.phone,
-            address=u.address,
-            status=u.status.value,
-            roles=[r.name for r in u.roles],
-            created_at=u.created_at,
-        )
-        for u in users
-    ]
+    rows = await user_service.list_users(db, scope, skip, limit, after)
+    _link_next_page(request, response, rows, limit)
+    return rows
 
 
 @router.post("/users/{user_id}/disable", response_model=MessageResponse)
@@ -125,10 +159,13 @@ async def disable_user(
     return MessageResponse(detail="User disabled successfully")
 
 
-@router.post("/users/{user_id}/force-logout", response_model=MessageResponse)
+@router.post(
+    "/users/{user_id}/force-logout",
+    response_model=MessageResponse,
+    dependencies=[Depends(require_permission("user.invite.operator", load_user=False))],
+)
 async def force_logout_user(
     user_id: uuid.UUID,
-    user: User = Depends(require_permission("user.invite.operator")),
     db: AsyncSession = Depends(get_db),
 ):
     """Deactivate all active sessions for a given user (admin action)."""
@@ -140,6 +177,7 @@ async def force_logout_user(
 @router.post("/invitations", response_model=InvitationOut, status_code=201)
 async def create_invitation(
     body: CreateInvitationRequest,
+    background_tasks: BackgroundTasks,
     user: User = Depends(require_permission("user.invite.operator")),
     db: AsyncSession = Depends(get_db),
 ):
@@ -150,24 +188,32 @@ async def create_invitation(
     control (e.g. separate permission for inviting clients), add
     an additional check inside the service or use a different route.
     """
-    invite = await invitation_service.create_invitation(
+    invite, token = await invitation_service.create_invitation(
         email=body.email,
         role_assigned=body.role_assigned,
         invited_by=user.id,
         db=db,
+        background_tasks=background_tasks,
     )
-    return InvitationOut.model_validate(invite)
+    return InvitationOut.model_validate(invite).model_copy(update={"token": token})
 
 
-@router.get("/invitations", response_model=list[InvitationOut])
+@router.get(
+    "/invitations",
+    response_model=list[InvitationOut],
+    dependencies=[Depends(require_permission("user.invite.operator", load_user=False))],
+)
 async def list_invitations(
-    user: User = Depends(require_permission("user.invite.operator")),
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    after: tuple[datetime, uuid.UUID] | None = Depends(keyset_cursor),
 ):
-    invites = await invitation_service.list_invitations(db, skip, limit)
-    return [InvitationOut.model_validate(inv) for inv in invites]
+    rows = await invitation_service.list_invitations(db, skip, limit, after)
+    _link_next_page(request, response, rows, limit)
+    return rows
 
 
 # ── Rooms ────────────────────────────────────────────────────────────
@@ -191,15 +237,15 @@ async def create_room(
 @router.get("/rooms", response_model=list[RoomOut])
 async def list_rooms(
     user: User = Depends(require_permission("room.create")),
+    scope: DataScope = Depends(get_data_scope),
     db: AsyncSession = Depends(get_db),
     warehouse_id: uuid.UUID | None = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
 ):
     """List rooms, optionally filtered by warehouse."""
-    scope = await resolve_data_scope(user, db)
     rooms = await room_service.list_rooms(db, scope, warehouse_id, skip, limit)
-    return [RoomOut.model_validate(r) for r in rooms]
+    return rooms
 
 
 # ── Racks ────────────────────────────────────────────────────────────
@@ -223,15 +269,15 @@ async def create_rack(
 @router.get("/racks", response_model=list[RackOut])
 async def list_racks(
     user: User = Depends(require_permission("rack.create")),
+    scope: DataScope = Depends(get_data_scope),
     db: AsyncSession = Depends(get_db),
     room_id: uuid.UUID | None = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
 ):
     """List racks, optionally filtered by room."""
-    scope = await resolve_data_scope(user, db)
     racks = await rack_service.list_racks(db, scope, room_id, skip, limit)
-    return [RackOut.model_validate(r) for r in racks]
+    return racks
 
 
 # ── Temperature Zones ────────────────────────────────────────────────
@@ -251,15 +297,18 @@ async def create_temperature_zone(
     return TemperatureZoneOut.model_validate(zone)
 
 
-@router.get("/temperature-zones", response_model=list[TemperatureZoneOut])
+@router.get(
+    "/temperature-zones",
+    response_model=list[TemperatureZoneOut],
+    dependencies=[Depends(require_permission("temperature.zone.view", load_user=False))],
+)
 async def list_temperature_zones(
-    user: User = Depends(require_permission("temperature.zone.view")),
     db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
 ):
     zones = await temperature_zone_service.list_temperature_zones(db, skip=skip, limit=limit)
-    return [TemperatureZoneOut.model_validate(z) for z in zones]
+    return zones
 
 
 @router.patch("/temperature-zones/{zone_id}", response_model=TemperatureZoneOut)
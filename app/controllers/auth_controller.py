@@ -12,7 +12,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import get_current_user_token
+from app.core.security import get_current_user_token, limit_login_attempts
 from app.schemas import (
     AcceptInvitationRequest,
     AcceptInvitationRequestOperator,
@@ -32,21 +32,28 @@ from app.services import auth_service, session_service
 router = APIRouter(prefix="/api/auth", tags=["Auth"])
 
 
-@router.post("/login", response_model=TokenResponse)
-async def login(body: LoginRequest, db: AsyncSession = Depends(get_db)):
+@router.post(
+    "/login",
+    response_model=TokenResponse,
+    dependencies=[Depends(limit_login_attempts)],
+)
+async def login(body: LoginRequest, db: AsyncSession = Depends(get_db)) -> TokenResponse:
     """Authenticate with email + password + device_id → receive JWT pair."""
-    return await auth_service.authenticate_user(
+    tokens = await auth_service.authenticate_user(
         body.email, body.password, body.device_id, db,
     )
+    # Service output is already well-typed — skip re-validating it.
+    return TokenResponse.model_construct(**tokens)
 
 
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(
     body: RefreshTokenRequest,
     db: AsyncSession = Depends(get_db),
-):
+) -> TokenResponse:
     """Exchange a valid refresh token for a new access + refresh pair."""
-    return await auth_service.refresh_access_token(body.refresh_token, db)
+    tokens = await auth_service.refresh_access_token(body.refresh_token, db)
+    return TokenResponse.model_construct(**tokens)
 
 
 @router.delete("/logout", response_model=MessageResponse)
@@ -101,7 +108,7 @@ async def get_invitation(
         id=invite.id,
         email=invite.email,
         role_assigned=invite.role_assigned,
-        token=invite.token,
+        token=token,
         status=invite.status.value,
         warehouses=warehouses,
         expires_at=invite.expires_at,
@@ -3,7 +3,7 @@ Client controller — client-scoped views.
 
 Every route enforces:
 1. Permission (via `require_permission`)
-2. Data scope (via `resolve_data_scope` — locks to client's own data)
+2. Data scope (via `get_data_scope` — locks to client's own data)
 
 Clients have a contractually fixed single login and can only see
 their own inventory and invoices.
@@ -14,8 +14,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.models.user import User
-from app.rbac.context_resolver import resolve_data_scope
-from app.rbac.dependencies import require_permission
+from app.rbac.context_resolver import DataScope
+from app.rbac.dependencies import get_data_scope, require_permission
 from app.schemas import ClientOut, ProductOut
 from app.services import inventory_service
 
@@ -28,6 +28,7 @@ async def get_my_profile(
     db: AsyncSession = Depends(get_db),
 ):
     """Return the client's own profile."""
+    await db.refresh(user, ["client"])
     if user.client is None:
         from fastapi import HTTPException, status
 
@@ -41,6 +42,7 @@ async def get_my_profile(
 @router.get("/inventory", response_model=list[ProductOut])
 async def list_my_inventory(
     user: User = Depends(require_permission("inventory.view")),
+    scope: DataScope = Depends(get_data_scope),
     db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
@@ -51,14 +53,13 @@ async def list_my_inventory(
     When the Inventory model is added, the service will filter:
         query.where(Inventory.client_id == scope.client_id)
     """
-    scope = await resolve_data_scope(user, db)
     return await inventory_service.list_inventory(db, scope, skip, limit)
 
 
 @router.get("/invoices")
 async def list_my_invoices(
     user: User = Depends(require_permission("invoice.view")),
-    db: AsyncSession = Depends(get_db),
+    scope: DataScope = Depends(get_data_scope),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
 ):
@@ -68,7 +69,6 @@ async def list_my_invoices(
     When the Invoice model is added, the service will filter:
         query.where(Invoice.client_id == scope.client_id)
     """
-    scope = await resolve_data_scope(user, db)
     # TODO: replace with billing_service.list_invoices(db, scope, skip, limit)
     return {
         "detail": "Client invoices listing (stub)",
@@ -3,7 +3,7 @@ Operator controller — warehouse-scoped views and inventory actions.
 
 Every route enforces:
 1. Permission (via `require_permission`)
-2. Data scope (via `resolve_data_scope` — locks to operator's warehouse)
+2. Data scope (via `get_data_scope` — locks to operator's warehouse)
 """
 
 import uuid
@@ -13,8 +13,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.models.user import User
-from app.rbac.context_resolver import resolve_data_scope
-from app.rbac.dependencies import require_permission
+from app.rbac.context_resolver import DataScope
+from app.rbac.dependencies import get_data_scope, require_permission
 from app.schemas import (
     InwardRequest,
     InwardResponse,
@@ -31,10 +31,14 @@ from app.services import warehouse_service, product_service, temperature_zone_se
 
 router = APIRouter(prefix="/api/operator", tags=["Operator"])
 
+# List endpoints return rows as-is; the route's response_model validates
+# and serialises them in one pass (see admin_controller).
+
 
 @router.get("/my-warehouse", response_model=WarehouseOut)
 async def get_my_warehouse(
     user: User = Depends(require_permission("inventory.view")),
+    scope: DataScope = Depends(get_data_scope),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -42,7 +46,6 @@ async def get_my_warehouse(
 
     The data scope ensures the operator can ONLY see their own warehouse.
     """
-    scope = await resolve_data_scope(user, db)
     if scope.warehouse_id is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -58,12 +61,12 @@ async def get_my_warehouse(
 async def create_product(
     body: ProductCreateRequest,
     user: User = Depends(require_permission("inventory.inward.create")),
+    scope: DataScope = Depends(get_data_scope),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Step 1: Create logical product (draft SKU entity).
     """
-    scope = await resolve_data_scope(user, db)
     if scope.warehouse_id:
         body.warehouse_id = scope.warehouse_id  # enforce warehouse assignment for operators
 
@@ -84,33 +87,34 @@ async def create_product(
 @router.get("/products", response_model=list[ProductOut])
 async def list_products(
     user: User = Depends(require_permission("inventory.view")),
+    scope: DataScope = Depends(get_data_scope),
     db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
 ):
     """List products/pallets for the operator's warehouse."""
-    scope = await resolve_data_scope(user, db)
     products = await product_service.list_products(db, scope, skip, limit)
-    return [ProductOut.model_validate(p) for p in products]
+    return products
 
 
 @router.get("/products/{product_id}", response_model=ProductOut)
 async def get_product(
     product_id: uuid.UUID,
     user: User = Depends(require_permission("inventory.view")),
+    scope: DataScope = Depends(get_data_scope),
     db: AsyncSession = Depends(get_db),
 ):
     """Get a single product by ID."""
-    scope = await resolve_data_scope(user, db)
     product = await product_service.get_product_by_id(product_id, db, scope)
     return ProductOut.model_validate(product)
 
 
 # ── Legacy stubs (kept for backward compat, delegate to new logic) ───
 
-@router.get("/inventory")
+@router.get("/inventory", response_model=list[ProductOut])
 async def list_inventory(
     user: User = Depends(require_permission("inventory.view")),
+    scope: DataScope = Depends(get_data_scope),
     db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
@@ -118,15 +122,15 @@ async def list_inventory(
     """
     List inventory for the operator's warehouse.
     """
-    scope = await resolve_data_scope(user, db)
     products = await product_service.list_products(db, scope, skip, limit)
-    return [ProductOut.model_validate(p) for p in products]
+    return products
 
 
 @router.post("/inventory/inward", response_model=InwardResponse, status_code=201)
 async def create_inward(
     body: InwardRequest,
     user: User = Depends(require_permission("inventory.inward.create")),
+    scope: DataScope = Depends(get_data_scope),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -134,7 +138,6 @@ async def create_inward(
 
     On inward failure, draft product is auto-deleted.
     """
-    scope = await resolve_data_scope(user, db)
     # if scope.warehouse_id is None:
     #     raise HTTPException(
     #         status_code=status.HTTP_403_FORBIDDEN,
@@ -183,15 +186,18 @@ async def create_temperature_zone(
     return TemperatureZoneOut.model_validate(zone)
 
 
-@router.get("/temperature-zones", response_model=list[TemperatureZoneOut])
+@router.get(
+    "/temperature-zones",
+    response_model=list[TemperatureZoneOut],
+    dependencies=[Depends(require_permission("temperature.zone.view", load_user=False))],
+)
 async def list_temperature_zones(
-    user: User = Depends(require_permission("temperature.zone.view")),
     db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
 ):
     zones = await temperature_zone_service.list_temperature_zones(db, skip=skip, limit=limit)
-    return [TemperatureZoneOut.model_validate(z) for z in zones]
+    return zones
 
 
 @router.patch("/temperature-zones/{zone_id}", response_model=TemperatureZoneOut)
@@ -0,0 +1,136 @@
+"""
+Optional Redis cache.
+
+- The client is created lazily from ``settings.REDIS_URL``; when that is
+  unset every helper is a no-op and reads behave as cache misses.
+- Redis is never the source of truth.  Connection / command errors are
+  logged and treated as misses so an outage degrades to the plain
+  PostgreSQL path instead of failing requests.
+- Keys that must be dropped once the request transaction commits are
+  queued on the DB session (``invalidate_on_commit``) and removed by
+  ``DBSessionMiddleware`` right after it commits (or discarded when it
+  rolls back) — deleting them earlier would let a concurrent request
+  re-cache the pre-commit row.
+"""
+
+import json
+import logging
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: Redis | None = None
+
+_PENDING_KEY = "cache_invalidate"
+
+
+def get_redis() -> Redis | None:
+    """Return the shared Redis client, or ``None`` when caching is disabled."""
+    global _client
+    if _client is None and settings.REDIS_URL:
+        _client = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _client
+
+
+async def ping() -> None:
+    """Open the Redis connection ahead of the first request."""
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.ping()
+    except RedisError:
+        logger.warning("Redis PING failed", exc_info=True)
+
+
+async def close_redis() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# ── JSON helpers ─────────────────────────────────────────────────────
+
+
+async def get_json(key: str) -> dict[str, Any] | None:
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        raw = await redis.get(key)
+    except RedisError:
+        logger.warning("Redis GET failed for %s", key, exc_info=True)
+        return None
+    return json.loads(raw) if raw else None
+
+
+async def set_json(key: str, value: dict[str, Any], ttl_seconds: int) -> None:
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.set(key, json.dumps(value), ex=ttl_seconds)
+    except RedisError:
+        logger.warning("Redis SET failed for %s", key, exc_info=True)
+
+
+async def delete(*keys: str) -> None:
+    redis = get_redis()
+    if redis is None or not keys:
+        return
+    try:
+        await redis.delete(*keys)
+    except RedisError:
+        logger.warning("Redis DEL failed for %s", keys, exc_info=True)
+
+
+async def incr_window(key: str, window_seconds: int) -> int | None:
+    """
+    Fixed-window counter — increment ``key`` and return the new count.
+
+    The window starts at the first hit.  Returns ``None`` when Redis is
+    unavailable so callers can fail open.
+    """
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        count = await redis.incr(key)
+        if count == 1:
+            await redis.expire(key, window_seconds)
+    except RedisError:
+        logger.warning("Redis INCR failed for %s", key, exc_info=True)
+        return None
+    return count
+
+
+# ── Commit-bound invalidation ────────────────────────────────────────
+
+
+def invalidate_on_commit(db: AsyncSession, *keys: str) -> None:
+    """Queue ``keys`` for deletion once ``db`` commits."""
+    db.info.setdefault(_PENDING_KEY, set()).update(keys)
+
+
+async def flush_invalidations(db: AsyncSession) -> None:
+    keys = db.info.pop(_PENDING_KEY, None)
+    if keys:
+        await delete(*keys)
+
+
+def discard_invalidations(db: AsyncSession) -> None:
+    db.info.pop(_PENDING_KEY, None)
+
+
+# ── Key builders ─────────────────────────────────────────────────────
+
+
+def session_key(session_id: Any) -> str:
+    return f"sess:{session_id}"
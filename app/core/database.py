@@ -1,22 +1,55 @@
 """
 Async SQLAlchemy engine & session factory.
 
-Every request gets its own AsyncSession via the `get_db` dependency.
-The session is committed/rolled-back automatically by the caller
-(services or controller) — we just guarantee cleanup on exit.
+Every HTTP request gets exactly one AsyncSession, opened by
+`DBSessionMiddleware` and exposed to routes through the `get_db`
+dependency.  The middleware commits just before a success (< 400)
+response is sent and rolls back on error responses or unhandled
+exceptions — so a client never sees a 2xx for work that didn't
+commit.  Cache keys queued via ``cache.invalidate_on_commit`` are
+dropped only after a successful commit.
 """
 
+import asyncio
+import uuid
+
+from fastapi import Request
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core import cache
 from app.core.config import settings
 
+# Behind PgBouncer (transaction mode) consecutive transactions may land
+# on different server connections, so nothing may rely on a named
+# prepared statement surviving: disable both asyncpg's and SQLAlchemy's
+# statement caches and give every statement a unique name.
+_connect_args: dict = (
+    {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+    if settings.DB_PGBOUNCER
+    # Otherwise keep enough prepared statements per connection that the
+    # hot auth / session queries are parsed and planned once.
+    else {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+)
+
 engine = create_async_engine(
     settings.DATABASE_URL,
+    connect_args=_connect_args,
     # echo=settings.DEBUG,
     future=True,
     pool_pre_ping=True,  # auto-recycle stale connections
-    pool_size=20,
-    pool_recycle=1800,  # 30 minutes
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,  # fail fast instead of hanging on exhaustion
+    pool_recycle=settings.DB_POOL_RECYCLE,
 )
 
 async_session_factory = async_sessionmaker(
@@ -26,14 +59,70 @@ async_session_factory = async_sessionmaker(
 )
 
 
-async def get_db() -> AsyncSession:  # type: ignore[misc]
-    """FastAPI dependency — yields an async DB session."""
-    async with async_session_factory() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+async def prewarm_pool() -> None:
+    """
+    Open ``DB_POOL_SIZE`` connections concurrently at startup.
+
+    Each is held until all are open, so the pool really grows to its
+    full size — the first burst of traffic then reuses warm connections
+    instead of paying connect + auth per request.
+    """
+
+    async def _ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_ping() for _ in range(settings.DB_POOL_SIZE)))
+
+
+class DBSessionMiddleware:
+    """
+    Pure ASGI middleware owning the per-request session lifecycle.
+
+    Written against raw ASGI rather than ``BaseHTTPMiddleware`` so the
+    request isn't re-wrapped in an extra task and stream per call.
+
+    The commit / rollback decision is made on the response *status*, not
+    on whether an exception was raised: a handler that returns a 4xx/5xx
+    response itself (instead of raising ``HTTPException``) has its work
+    rolled back too.  Under the old ``get_db`` dependency such a handler
+    committed.  Writes that must survive an error response need their
+    own session / transaction.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async with async_session_factory() as session:
+            scope.setdefault("state", {})["db"] = session
+            finished = False
+
+            async def send_with_commit(message: Message) -> None:
+                nonlocal finished
+                if message["type"] == "http.response.start" and not finished:
+                    finished = True
+                    if message["status"] < 400:
+                        await session.commit()
+                        await cache.flush_invalidations(session)
+                    else:
+                        await session.rollback()
+                        cache.discard_invalidations(session)
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_commit)
+            except Exception:
+                if not finished:
+                    await session.rollback()
+                    cache.discard_invalidations(session)
+                raise
+
+
+async def get_db(request: Request) -> AsyncSession:
+    """FastAPI dependency — returns the request's session (see `DBSessionMiddleware`)."""
+    return request.state.db
@@ -1,85 +1,265 @@
 """
 Password hashing & JWT helpers.
 
-- Passwords are hashed with bcrypt directly (passlib is unmaintained
-  and broken with bcrypt>=4.1).
+- Passwords are hashed with argon2id.  Legacy bcrypt hashes (``$2b$``)
+  still verify and are upgraded on the next successful login (passlib
+  is unmaintained and broken with bcrypt>=4.1, so neither goes
+  through it).  Request handlers use the ``*_async`` variants, which
+  run the hash on a small thread pool (both libraries release the GIL)
+  instead of blocking the event loop.
 - JWTs carry user_id, role, device_id, session_id, and contextual IDs.
+  Verified payloads are memoised briefly per process (keyed by the
+  token's SHA-256) — revocation still goes through the session check.
 - Token verification validates against the server-side session
-  registry on EVERY request (hybrid stateful JWT).
+  registry on EVERY request (hybrid stateful JWT).  The registry row is
+  cached in Redis (when configured) so the common path skips the
+  database; ``last_seen_at`` writes are debounced.
 - Refresh tokens support rotation with SHA-256 hash storage.
 """
 
+import asyncio
+import functools
 import hashlib
+import json
+import os
+import secrets
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import bcrypt
-from fastapi import Depends, HTTPException, status
+import jwt
+from jwt.algorithms import get_default_algorithms
+from jwt.utils import base64url_encode
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import cache
 from app.core.config import settings
 from app.core.database import get_db
-from app.models.session import UserSession
+from app.core.session_activity import record_activity
 
 # ── Password hashing ────────────────────────────────────────────────
 
 
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+
 def hash_password(plain: str) -> str:
-    return bcrypt.hashpw(plain.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    return _password_hasher.hash(plain)
 
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return bcrypt.checkpw(plain.encode("utf-8"), hashed.encode("utf-8"))
+    if hashed.startswith(_BCRYPT_PREFIXES):
+        return bcrypt.checkpw(plain.encode("utf-8"), hashed.encode("utf-8"))
+    try:
+        return _password_hasher.verify(hashed, plain)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+# Verified against when the login email is unknown, so both branches
+# cost one full hash and response timing doesn't reveal which accounts
+# exist.  Built on first use rather than at import, so startup doesn't
+# pay for an argon2 hash.
+@functools.cache
+def _dummy_password_hash() -> str:
+    return _password_hasher.hash(secrets.token_urlsafe(16))
+
+
+def verify_dummy_password(plain: str) -> None:
+    """Burn the same work as a real verify; always fails."""
+    verify_password(plain, _dummy_password_hash())
+
+
+# Bounded separately from the default executor: each argon2 hash holds
+# ``memory_cost`` KiB, so concurrency is capped at the core count.
+_password_pool = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1,
+    thread_name_prefix="password-hash",
+)
+
+
+async def hash_password_async(plain: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_pool, hash_password, plain)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_pool, verify_password, plain, hashed)
+
+
+async def verify_dummy_password_async(plain: str) -> None:
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_password_pool, verify_dummy_password, plain)
+
+
+def password_needs_rehash(hashed: str) -> bool:
+    """True for legacy bcrypt hashes or argon2 hashes with stale parameters."""
+    if hashed.startswith(_BCRYPT_PREFIXES):
+        return True
+    return _password_hasher.check_needs_rehash(hashed)
 
 
 # ── Token hashing (for refresh tokens) ──────────────────────────────
 
 
-def hash_token(token: str) -> str:
-    """SHA-256 hash — suitable for high-entropy tokens like JWTs."""
-    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+def hash_token(token: str | bytes) -> str:
+    """
+    SHA-256 hash — suitable for high-entropy tokens like JWTs.
+
+    Accepts the raw bytes directly so callers that already hold them
+    skip the extra ``encode`` copy.
+    """
+    data = token if isinstance(token, bytes) else token.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def digest_token(token: str) -> bytes:
+    """Raw 32-byte SHA-256 digest, for fixed-width ``BYTEA`` token columns."""
+    return hashlib.sha256(token.encode("utf-8")).digest()
 
 
 # ── JWT ──────────────────────────────────────────────────────────────
+
+# Shared by every 401 below; Starlette only reads it, so one instance
+# serves all responses.
+_UNAUTHORIZED_HEADERS = {"WWW-Authenticate": "Bearer"}
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers=_UNAUTHORIZED_HEADERS,
+    )
+
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
+# Settings are fixed for the process lifetime, so the key is encoded
+# once and the lifetimes are built once rather than per token.
+_SIGNING_KEY = settings.SECRET_KEY.encode("utf-8")
+_ACCESS_TOKEN_TTL = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+_REFRESH_TOKEN_TTL = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+# The header never changes and the key is prepared once, so signing a
+# token is one payload ``json.dumps`` plus the HMAC.  Tokens are
+# byte-for-byte what ``jwt.encode`` produces and are verified with
+# ``jwt.decode`` as before.
+_JWT_ALGORITHM = get_default_algorithms()[settings.JWT_ALGORITHM]
+_JWT_KEY = _JWT_ALGORITHM.prepare_key(_SIGNING_KEY)
+_JWT_HEADER_B64 = base64url_encode(
+    json.dumps(
+        {"alg": settings.JWT_ALGORITHM, "typ": "JWT"},
+        separators=(",", ":"),
+        sort_keys=True,
+    ).encode("utf-8")
+)
+
+
+def _encode_jwt(claims: dict[str, Any], expire: datetime) -> str:
+    claims["exp"] = int(expire.timestamp())
+    payload_b64 = base64url_encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    signing_input = b".".join((_JWT_HEADER_B64, payload_b64))
+    signature = base64url_encode(_JWT_ALGORITHM.sign(signing_input, _JWT_KEY))
+    return b".".join((signing_input, signature)).decode("ascii")
+
+
 def create_access_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
-    to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + (
-        expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    )
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    expire = datetime.now(timezone.utc) + (expires_delta or _ACCESS_TOKEN_TTL)
+    return _encode_jwt({**data}, expire)
 
 
 def create_refresh_token(data: dict[str, Any]) -> str:
     """Create a long-lived refresh token with rotation support."""
-    to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    expire = datetime.now(timezone.utc) + _REFRESH_TOKEN_TTL
+    return _encode_jwt({**data, "type": "refresh"}, expire)
 
 
-def decode_access_token(token: str) -> dict[str, Any]:
-    """Decode & validate a JWT.  Raises HTTPException on failure."""
+_decoded_tokens: TTLCache[bytes, dict[str, Any]] = TTLCache(
+    maxsize=settings.JWT_DECODE_CACHE_SIZE,
+    ttl=settings.JWT_DECODE_CACHE_TTL_SECONDS,
+)
+
+
+def _verify_access_token(token: str) -> dict[str, Any]:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        return jwt.decode(
+            token,
+            _SIGNING_KEY,
+            algorithms=[settings.JWT_ALGORITHM],
+            options={"require": ["exp", "sub", "session_id"]},
+        )
+    except jwt.PyJWTError:
+        raise _unauthorized("Invalid or expired token")
+
+
+async def decode_access_token(token: str) -> dict[str, Any]:
+    """
+    Decode & validate a JWT.  Raises HTTPException on failure.
+
+    Cache hits are answered inline; only a miss pays for signature
+    verification, which runs in a worker thread so a burst of fresh
+    tokens doesn't stall the event loop.
+
+    The returned payload may be shared with other requests presenting
+    the same token — treat it as read-only.
+    """
+    cache_key = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = _decoded_tokens.get(cache_key)
+    if payload is not None and payload["exp"] > time.time():
         return payload
-    except JWTError:
+
+    payload = await asyncio.to_thread(_verify_access_token, token)
+    _decoded_tokens[cache_key] = payload
+    return payload
+
+
+# ── Login throttling ────────────────────────────────────────────────
+
+
+async def limit_login_attempts(request: Request) -> None:
+    """
+    FastAPI dependency — per-IP fixed-window limit on login attempts.
+
+    Keeps brute-force traffic from monopolising CPU on password hashing.
+    Fails open (no limit) when Redis isn't configured or reachable.
+    """
+    client_ip = request.client.host if request.client else "unknown"
+    attempts = await cache.incr_window(
+        f"rl:login:{client_ip}", settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+    )
+    if attempts is not None and attempts > settings.LOGIN_RATE_LIMIT_ATTEMPTS:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts — try again later",
+            headers={"Retry-After": str(settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS)},
         )
 
 
 # ── Per-request session validation ──────────────────────────────────
 
+# Settings are fixed for the process lifetime — derive once.
+_INACTIVITY_TIMEOUT_SECONDS = settings.SESSION_INACTIVITY_TIMEOUT_MINUTES * 60
+_SESSION_CACHE_TTL_SECONDS = min(
+    settings.SESSION_CACHE_TTL_SECONDS, _INACTIVITY_TIMEOUT_SECONDS,
+)
+
+# The same few session / user ids arrive on every request of a session;
+# memoise their parsing.  Bounded, so a flood of junk ids can't grow it.
+_to_uuid = functools.lru_cache(maxsize=10_000)(uuid.UUID)
+
 
 async def get_current_user_token(
     token: str = Depends(oauth2_scheme),
@@ -95,56 +275,114 @@ async def get_current_user_token(
       3. Device ID in JWT matches session record.
       4. Session has not exceeded the inactivity timeout.
 
-    On success, updates ``last_seen_at`` (committed with the request
-    transaction).
+    The session row is served from Redis when cached; on a miss (or
+    any failed check against the cached copy) PostgreSQL is queried.
+
+    On success, queues a ``last_seen_at`` bump if it is older than
+    ``SESSION_TOUCH_INTERVAL_SECONDS`` (written by the background
+    flusher, not the request transaction).
     """
-    payload = decode_access_token(token)
+    payload = await decode_access_token(token)
 
-    session_id = payload.get("session_id")
-    user_id = payload.get("sub") or payload.get("user_id")
+    # ``sub`` and ``session_id`` are guaranteed present by the decode.
+    session_id = payload["session_id"]
+    user_id = payload["sub"]
     device_id = payload.get("device_id")
 
-    if not all([session_id, user_id, device_id]):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload — missing session fields",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    if not session_id or not user_id or not device_id:
+        raise _unauthorized("Invalid token payload — missing session fields")
+
+    now = time.time()
+    key = cache.session_key(session_id)
+
+    # ── Fast path: cached registry entry ─────────────────────────────
+    # Only a fully valid entry is trusted.  Anything else (miss, device
+    # mismatch, stale ``last_seen_at``) falls through to PostgreSQL,
+    # which stays authoritative.
+    cached = await cache.get_json(key)
+    if (
+        cached is not None
+        and cached["is_active"]
+        and cached["user_id"] == user_id
+        and cached["device_id"] == device_id
+        and now - cached["last_seen_at"] <= _INACTIVITY_TIMEOUT_SECONDS
+    ):
+        await _touch_session(session_id, cached, now, from_cache=True)
+        return payload
 
-    # Query the session registry
-    stmt = select(UserSession).where(
-        UserSession.id == uuid.UUID(session_id),
-        UserSession.user_id == uuid.UUID(str(user_id)),
-        UserSession.is_active == True,  # noqa: E712
+    # ── Slow path: query the session registry ───────────────────────
+    session = await _fetch_session_row(
+        db, _to_uuid(session_id), _to_uuid(user_id),
     )
-    result = await db.execute(stmt)
-    session = result.scalar_one_or_none()
 
     if session is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Session expired or revoked",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized("Session expired or revoked")
 
-    if session.device_id != device_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Device mismatch — session invalid",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    if session["device_id"] != device_id:
+        raise _unauthorized("Device mismatch — session invalid")
 
     # Inactivity timeout check
-    now = datetime.now(timezone.utc)
-    elapsed_seconds = (now - session.last_seen_at).total_seconds()
-    if elapsed_seconds > settings.SESSION_INACTIVITY_TIMEOUT_MINUTES * 60:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Session timed out due to inactivity",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    # Update last_seen_at (best-effort — committed with the request)
-    session.last_seen_at = now
+    last_seen_at = session["last_seen_at"].timestamp()
+    if now - last_seen_at > _INACTIVITY_TIMEOUT_SECONDS:
+        raise _unauthorized("Session timed out due to inactivity")
+
+    entry = {
+        "user_id": user_id,
+        "device_id": session["device_id"],
+        "is_active": True,
+        "last_seen_at": last_seen_at,
+    }
+    await _touch_session(session_id, entry, now, from_cache=False)
 
     return payload
+
+
+# Selects only the columns carried by ix_user_sessions_lookup, so
+# PostgreSQL can answer from the index without touching the heap.
+_SESSION_LOOKUP_SQL = (
+    "SELECT device_id, last_seen_at FROM user_sessions "
+    "WHERE id = $1 AND user_id = $2 AND is_active"
+)
+
+
+async def _fetch_session_row(
+    db: AsyncSession,
+    session_id: uuid.UUID,
+    user_id: uuid.UUID,
+) -> Any:
+    """
+    Run the session lookup directly on the request's asyncpg connection.
+
+    This is the single hottest query in the app, so it skips SQLAlchemy
+    statement compilation and row hydration.  asyncpg keeps a prepared
+    statement per connection keyed by the SQL text, so repeated calls
+    only bind and execute.  Returns an ``asyncpg.Record`` or ``None``.
+    """
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    return await raw.driver_connection.fetchrow(_SESSION_LOOKUP_SQL, session_id, user_id)
+
+
+async def _touch_session(
+    session_id: str,
+    entry: dict[str, Any],
+    now: float,
+    *,
+    from_cache: bool,
+) -> None:
+    """
+    Persist ``last_seen_at`` at most once per
+    ``SESSION_TOUCH_INTERVAL_SECONDS`` and keep the cache entry in step.
+
+    The write itself is buffered and flushed in batches by
+    ``app.core.session_activity``.  The cache TTL
+    never exceeds the inactivity timeout, so an entry cannot outlive the
+    session it describes.
+    """
+    if now - entry["last_seen_at"] > settings.SESSION_TOUCH_INTERVAL_SECONDS:
+        record_activity(_to_uuid(session_id), datetime.fromtimestamp(now, timezone.utc))
+        entry = {**entry, "last_seen_at": now}
+    elif from_cache:
+        return
+
+    await cache.set_json(cache.session_key(session_id), entry, _SESSION_CACHE_TTL_SECONDS)
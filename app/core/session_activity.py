@@ -0,0 +1,85 @@
+"""
+Buffered ``user_sessions.last_seen_at`` writes.
+
+Request handlers call ``record_activity`` instead of issuing an UPDATE;
+a background task started in the app lifespan drains the buffer every
+``SESSION_ACTIVITY_FLUSH_SECONDS`` and writes it back in one batched
+statement.
+
+- The buffer is a dict keyed by session id, so repeated hits on the
+  same session coalesce to the newest timestamp before flushing.
+- The UPDATE uses ``GREATEST`` so a late flush can never move
+  ``last_seen_at`` backwards (e.g. past a fresh login on another
+  worker).
+- A final flush runs on shutdown.  Activity buffered by a worker that
+  dies hard is lost — acceptable for a liveness timestamp.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.models.session import UserSession
+
+logger = logging.getLogger(__name__)
+
+_pending: dict[uuid.UUID, datetime] = {}
+
+_table = UserSession.__table__
+_flush_stmt = (
+    update(_table)
+    .where(_table.c.id == bindparam("b_id"))
+    .values(
+        last_seen_at=func.greatest(
+            _table.c.last_seen_at,
+            bindparam("b_ts", type_=_table.c.last_seen_at.type),
+        )
+    )
+)
+
+
+def record_activity(session_id: uuid.UUID, seen_at: datetime) -> None:
+    """Buffer a ``last_seen_at`` bump for the next flush."""
+    current = _pending.get(session_id)
+    if current is None or seen_at > current:
+        _pending[session_id] = seen_at
+
+
+async def flush_activity(engine: AsyncEngine) -> int:
+    """Write all buffered timestamps in one executemany.  Returns the row count."""
+    global _pending
+    if not _pending:
+        return 0
+    batch, _pending = _pending, {}
+    params = [{"b_id": sid, "b_ts": ts} for sid, ts in batch.items()]
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(_flush_stmt, params)
+    except Exception:
+        # Put the batch back (newer in-flight entries win) and retry
+        # on the next tick.
+        for sid, ts in batch.items():
+            record_activity(sid, ts)
+        raise
+    return len(params)
+
+
+async def run_activity_flusher(engine: AsyncEngine) -> None:
+    """Background loop — flushes until cancelled, then flushes once more."""
+    try:
+        while True:
+            await asyncio.sleep(settings.SESSION_ACTIVITY_FLUSH_SECONDS)
+            try:
+                await flush_activity(engine)
+            except Exception:
+                logger.exception("Failed to flush session activity")
+    finally:
+        try:
+            await flush_activity(engine)
+        except Exception:
+            logger.exception("Failed to flush session activity on shutdown")
@@ -3,36 +3,69 @@ FastAPI application factory.
 
 Assembles the app, registers all routers, and wires up lifecycle
 events.  Database schema is managed by Alembic — NOT create_all.
+
+Only FastAPI and settings are imported at module scope.  Controllers,
+services, models and the DB engine are imported inside `create_app()`,
+so tooling that merely imports this module (CLIs, `--help`, tests that
+build their own app) doesn't pay for the whole dependency graph.
 """
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.controllers.admin_controller import router as admin_router
-from app.controllers.auth_controller import router as auth_router
-from app.controllers.client_controller import router as client_router
-from app.controllers.inventory_analytics_controller import router as inventory_analytics_router
-from app.controllers.operator_controller import router as operator_router
 from app.core.config import settings
-from app.core.database import engine
-from app.models import Base  # noqa: F401 — ensures all models are registered
 
 logger = logging.getLogger(__name__)
 
+_HEALTH_RESPONSE = Response(content=b'{"status":"ok"}', media_type="application/json")
+
 
 def create_app() -> FastAPI:
+    # Register every model up front so mapper configuration never sees
+    # a half-populated registry.
+    from app.models import register_all
+
+    register_all()
+
+    from app.controllers.admin_controller import router as admin_router
+    from app.controllers.auth_controller import router as auth_router
+    from app.controllers.client_controller import router as client_router
+    from app.controllers.inventory_analytics_controller import router as inventory_analytics_router
+    from app.controllers.operator_controller import router as operator_router
+    from app.core.cache import close_redis, ping as ping_redis
+    from app.core.database import DBSessionMiddleware, engine, prewarm_pool
+    from app.core.session_activity import run_activity_flusher
+    from app.services.email_service import close_smtp
+
     # ── Startup / Shutdown ───────────────────────────────────────────
-    from contextlib import asynccontextmanager
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         # Startup — seeding is handled separately via:
         #   python -m app.rbac.permission_seed
+        # Warm PostgreSQL and Redis side by side: startup waits for the
+        # slower of the two, not their sum.
+        pool_warm, _ = await asyncio.gather(
+            prewarm_pool(), ping_redis(), return_exceptions=True
+        )
+        if isinstance(pool_warm, Exception):
+            # Not fatal — requests open connections on demand as before.
+            logger.error("Database pool pre-warm failed", exc_info=pool_warm)
+        logger.info("Database pool: %s", engine.pool.status())
+        activity_flusher = asyncio.create_task(run_activity_flusher(engine))
+
         yield
 
-        # Shutdown
+        # Shutdown — the flusher writes any buffered activity on cancel
+        activity_flusher.cancel()
+        await asyncio.gather(activity_flusher, return_exceptions=True)
+        await close_redis()
+        await close_smtp()
+        logger.info("Database pool at shutdown: %s", engine.pool.status())
         await engine.dispose()
         logger.info("Database engine disposed.")
 
@@ -44,6 +77,9 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
+    # ── Per-request DB session (added first so CORS wraps it) ────────
+    app.add_middleware(DBSessionMiddleware)
+
     # ── CORS ──────────────────────────────────────────────────────────
     app.add_middleware(
         CORSMiddleware,
@@ -61,11 +97,20 @@ def create_app() -> FastAPI:
     app.include_router(inventory_analytics_router)
 
     # ── Health check ─────────────────────────────────────────────────
-    @app.get("/health", tags=["Health"])
-    async def health():
-        return {"status": "ok"}
+    # Probes hit this constantly: hand back one prebuilt response rather
+    # than encoding a dict per call.
+    @app.get("/health", tags=["Health"], include_in_schema=False)
+    async def health() -> Response:
+        return _HEALTH_RESPONSE
 
     return app
 
 
-app = create_app()
+def __getattr__(name: str) -> FastAPI:
+    # `app` is built on first access (uvicorn's `app.main:app`, or
+    # `from app.main import app`) rather than at import.
+    if name == "app":
+        application = create_app()
+        globals()["app"] = application
+        return application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,53 +1,93 @@
 """
-Models package — import every model so SQLAlchemy's Base.metadata
-knows about all tables (critical for `create_all` / Alembic).
+Models package.
+
+Importing the package only loads the declarative ``Base`` and mixins;
+every model module is imported on first attribute access (PEP 562
+``__getattr__``), so ``from app.models import Base`` stays cheap.
+
+SQLAlchemy resolves relationship targets by class name, so every model
+must be imported before mappers are configured or ``Base.metadata`` is
+inspected.  Call ``register_all()`` for that — `create_app()`, Alembic's
+env.py and the CLI scripts do.
 """
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
-from app.models.user import User, UserStatus
-from app.models.role import Role, user_roles, role_permissions
-from app.models.permission import Permission
-from app.models.warehouse import Warehouse
-from app.models.operator_profile import OperatorProfile
-from app.models.client import Client
-from app.models.invitation import Invitation, InvitationStatus
-from app.models.session import UserSession
-from app.models.enums import MovementType, AuditAction
-from app.models.product import Product, ProductCategory, StorageUnit
-from app.models.inventory_ledger import InventoryLedger
-from app.models.audit_log import AuditLog
-from app.models.password_reset_otp import PasswordResetOTP
-from app.models.room import Room
-from app.models.rack import Rack
-from app.models.rack_allocation import RackAllocation
-from app.models.temperature_zone import TemperatureZone
+
+if TYPE_CHECKING:
+    from app.models.audit_log import AuditLog
+    from app.models.client import Client
+    from app.models.enums import AuditAction, MovementType
+    from app.models.inventory_ledger import InventoryLedger
+    from app.models.invitation import Invitation, InvitationStatus
+    from app.models.operator_profile import OperatorProfile
+    from app.models.password_reset_otp import PasswordResetOTP
+    from app.models.permission import Permission, rbac_version
+    from app.models.product import Product, ProductCategory, StorageUnit
+    from app.models.rack import Rack
+    from app.models.rack_allocation import RackAllocation
+    from app.models.role import Role, role_permissions, user_roles
+    from app.models.room import Room
+    from app.models.session import UserSession
+    from app.models.temperature_zone import TemperatureZone
+    from app.models.user import User, UserStatus
+    from app.models.warehouse import Warehouse
+
+# Public name → defining module.  Order matters only for readability.
+_LAZY: dict[str, str] = {
+    "User": "app.models.user",
+    "UserStatus": "app.models.user",
+    "Role": "app.models.role",
+    "user_roles": "app.models.role",
+    "role_permissions": "app.models.role",
+    "Permission": "app.models.permission",
+    "rbac_version": "app.models.permission",
+    "Warehouse": "app.models.warehouse",
+    "OperatorProfile": "app.models.operator_profile",
+    "Client": "app.models.client",
+    "Invitation": "app.models.invitation",
+    "InvitationStatus": "app.models.invitation",
+    "UserSession": "app.models.session",
+    "MovementType": "app.models.enums",
+    "AuditAction": "app.models.enums",
+    "Product": "app.models.product",
+    "ProductCategory": "app.models.product",
+    "StorageUnit": "app.models.product",
+    "InventoryLedger": "app.models.inventory_ledger",
+    "AuditLog": "app.models.audit_log",
+    "PasswordResetOTP": "app.models.password_reset_otp",
+    "Room": "app.models.room",
+    "Rack": "app.models.rack",
+    "RackAllocation": "app.models.rack_allocation",
+    "TemperatureZone": "app.models.temperature_zone",
+}
+
+
+def register_all() -> None:
+    """Import every model module so all tables and mappers are registered."""
+    for module in dict.fromkeys(_LAZY.values()):
+        importlib.import_module(module)
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY])
+
 
 __all__ = [
     "Base",
     "TimestampMixin",
     "UUIDPrimaryKeyMixin",
-    "User",
-    "UserStatus",
-    "Role",
-    "user_roles",
-    "role_permissions",
-    "Permission",
-    "Warehouse",
-    "OperatorProfile",
-    "Client",
-    "Invitation",
-    "InvitationStatus",
-    "UserSession",
-    "MovementType",
-    "AuditAction",
-    "Product",
-    "ProductCategory",
-    "StorageUnit",
-    "InventoryLedger",
-    "AuditLog",
-    "PasswordResetOTP",
-    "Room",
-    "Rack",
-    "RackAllocation",
-    "TemperatureZone",
+    "register_all",
+    *_LAZY,
 ]
@@ -15,7 +15,7 @@ Rules:
 from __future__ import annotations
 
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 
 from sqlalchemy import (
     DateTime,
@@ -75,7 +75,6 @@ class AuditLog(Base, UUIDPrimaryKeyMixin):
     # ── Timestamp ────────────────────────────────────────────────────
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
         server_default=func.now(),
         nullable=False,
         index=True,
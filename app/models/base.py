@@ -2,47 +2,65 @@
 Declarative base & shared mixins for all models.
 
 Every table gets:
-- A UUID primary key (generated server-side via `uuid4`).
-- `created_at` / `updated_at` timestamps (UTC, auto-managed).
+- A UUID primary key (generated by PostgreSQL via `gen_random_uuid()`).
+- `created_at` / `updated_at` timestamps (UTC, set by the database).
 
 Using a mixin keeps individual model files focused on domain fields.
 """
 
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 
-from sqlalchemy import DateTime, func
+from sqlalchemy import DateTime, func, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
 class Base(DeclarativeBase):
     """SQLAlchemy declarative base — all models inherit from this."""
-    pass
+
+    # Every `Mapped[uuid.UUID]` column — primary and foreign keys alike —
+    # is PostgreSQL's native 16-byte UUID.
+    type_annotation_map = {uuid.UUID: PG_UUID(as_uuid=True)}
 
 
 class TimestampMixin:
-    """Adds created_at / updated_at to any model that inherits it."""
+    """
+    Adds created_at / updated_at to any model that inherits it.
+
+    Both are set by PostgreSQL: `server_default` on INSERT, `func.now()`
+    on ORM updates, and a `BEFORE UPDATE` trigger for Core statements
+    that bypass the ORM.  `eager_defaults` fetches the new values via
+    RETURNING so reading them after a flush doesn't lazy-load.
+    """
+
+    __mapper_args__ = {"eager_defaults": True}
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
         server_default=func.now(),
         nullable=False,
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
         server_default=func.now(),
-        onupdate=lambda: datetime.now(timezone.utc),
+        onupdate=func.now(),
         nullable=False,
     )
 
 
 class UUIDPrimaryKeyMixin:
-    """Adds a UUID `id` primary key to any model that inherits it."""
+    """
+    Adds a UUID `id` primary key to any model that inherits it.
+
+    The id is generated by the database and comes back via RETURNING on
+    flush, so it is only available after `flush()` — pass `id=` explicitly
+    when it is needed before the row is written.
+    """
 
     id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        server_default=text("gen_random_uuid()"),
         nullable=False,
     )
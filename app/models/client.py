@@ -40,11 +40,11 @@ class Client(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     user: Mapped["User"] = relationship(  # noqa: F821
         back_populates="client",
         foreign_keys=[user_id],
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
     created_by_admin: Mapped["User | None"] = relationship(  # noqa: F821
         foreign_keys=[created_by_admin_id],
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
@@ -16,7 +16,7 @@ Rules:
 from __future__ import annotations
 
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 from decimal import Decimal
 
 from sqlalchemy import (
@@ -79,7 +79,6 @@ class InventoryLedger(Base, UUIDPrimaryKeyMixin):
     reason: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
         server_default=func.now(),
         nullable=False,
         index=True,
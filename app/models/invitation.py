@@ -6,13 +6,16 @@ Invitation model.
 Admin sends an invite → creates an Invitation row with a unique token.
 The invited user clicks the link, sets a password, and their status
 transitions from INVITED → ACTIVE.
+
+Only the SHA-256 digest of the token is stored; the token itself exists
+in the invitation email and the create response.
 """
 
 import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, ForeignKey, String
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, LargeBinary, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from typing import TYPE_CHECKING
@@ -32,24 +35,43 @@ class InvitationStatus(str, enum.Enum):
 class Invitation(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     __tablename__ = "invitations"
 
-    email: Mapped[str] = mapped_column(String(256), nullable=False, index=True)
+    email: Mapped[str] = mapped_column(String(256), nullable=False)
     invited_by: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("users.id", ondelete="SET NULL"),
         nullable=True,
     )
     role_assigned: Mapped[str] = mapped_column(String(64), nullable=False)
-    token: Mapped[str] = mapped_column(String(512), unique=True, nullable=False)
+    token_hash: Mapped[bytes] = mapped_column(LargeBinary(32), unique=True, nullable=False)
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     status: Mapped[InvitationStatus] = mapped_column(
-        Enum(InvitationStatus, name="invitation_status"),
+        Enum(
+            InvitationStatus,
+            name="ck_invitations_status",
+            native_enum=False,
+            length=16,
+            create_constraint=True,
+        ),
         default=InvitationStatus.PENDING,
+        server_default=InvitationStatus.PENDING.value,
         nullable=False,
     )
 
     # ── Relationships ────────────────────────────────────────────────
     inviter: Mapped["User | None"] = relationship(  # noqa: F821
         foreign_keys=[invited_by],
-        lazy="selectin",
+        lazy="raise_on_sql",
+    )
+
+    __table_args__ = (
+        # At most one PENDING invitation per email, enforced by the DB.
+        Index(
+            "ix_invitations_email_pending",
+            "email",
+            unique=True,
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+        # Keyset pagination for the admin list (newest first).
+        Index("ix_invitations_created", "created_at", "id"),
     )
 
     def __repr__(self) -> str:
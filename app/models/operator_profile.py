@@ -40,11 +40,11 @@ class OperatorProfile(Base, TimestampMixin):
     # ── Relationships ────────────────────────────────────────────────
     user: Mapped["User"] = relationship(  # noqa: F821
         back_populates="operator_profile",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
     warehouse: Mapped["Warehouse"] = relationship(  # noqa: F821
         back_populates="operator_profiles",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
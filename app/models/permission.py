@@ -7,11 +7,14 @@ Permissions are *immutable codes* that map to a single action in the
 system (e.g. `inventory.inward.create`).  They are seeded at deploy
 time and referenced by role ↔ permission associations — never checked
 by role name in endpoint logic.
+
+`rbac_version` is a single-row counter the permission seed bumps, so
+workers know when their cached role → permission mapping is stale.
 """
 
 import uuid
 
-from sqlalchemy import String
+from sqlalchemy import BigInteger, Column, SmallInteger, String, Table, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from typing import TYPE_CHECKING
@@ -21,6 +24,15 @@ from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
 if TYPE_CHECKING:
     from app.models.role import Role
 
+rbac_version = Table(
+    "rbac_version",
+    Base.metadata,
+    Column("id", SmallInteger, primary_key=True),
+    Column("version", BigInteger, nullable=False, server_default=text("0")),
+    # sha256 of the seed definition last applied (see permission_seed).
+    Column("seed_hash", String(64), nullable=True),
+)
+
 
 class Permission(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     __tablename__ = "permissions"
@@ -32,7 +44,7 @@ class Permission(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     roles: Mapped[list["Role"]] = relationship(  # noqa: F821
         secondary="role_permissions",
         back_populates="permissions",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
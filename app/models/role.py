@@ -11,7 +11,7 @@ handles them transparently.
 
 import uuid
 
-from sqlalchemy import Column, ForeignKey, String, Table
+from sqlalchemy import Column, ForeignKey, Index, String, Table
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from typing import TYPE_CHECKING
@@ -28,6 +28,8 @@ user_roles = Table(
     Base.metadata,
     Column("user_id", ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
     Column("role_id", ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True),
+    # The PK covers user → roles; this covers role → users.
+    Index("ix_user_roles_role", "role_id"),
 )
 
 role_permissions = Table(
@@ -35,6 +37,8 @@ role_permissions = Table(
     Base.metadata,
     Column("role_id", ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True),
     Column("permission_id", ForeignKey("permissions.id", ondelete="CASCADE"), primary_key=True),
+    # The PK covers role → permissions; this covers permission → roles.
+    Index("ix_role_permissions_perm", "permission_id"),
 )
 
 
@@ -48,12 +52,12 @@ class Role(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     users: Mapped[list["User"]] = relationship(  # noqa: F821
         secondary=user_roles,
         back_populates="roles",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
     permissions: Mapped[list["Permission"]] = relationship(  # noqa: F821
         secondary=role_permissions,
         back_populates="roles",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
@@ -11,7 +11,7 @@ Tracks active login sessions per user, enabling:
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -22,7 +22,7 @@ class UserSession(Base):
 
     id: Mapped[uuid.UUID] = mapped_column(
         primary_key=True,
-        default=uuid.uuid4,
+        server_default=text("gen_random_uuid()"),
         nullable=False,
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
@@ -47,11 +47,24 @@ class UserSession(Base):
         Boolean,
         default=True,
         nullable=False,
-        index=True,
     )
 
     __table_args__ = (
-        Index("ix_user_sessions_user_active", "user_id", "is_active"),
+        # Only active sessions are ever looked up by user; history rows
+        # stay out of the index entirely.
+        Index(
+            "ix_user_sessions_active",
+            "user_id",
+            postgresql_where=text("is_active"),
+        ),
+        # Covers the per-request session validation lookup so it can be
+        # served by an index-only scan.
+        Index(
+            "ix_user_sessions_lookup",
+            "id",
+            postgresql_include=["user_id", "device_id", "last_seen_at"],
+            postgresql_where=text("is_active"),
+        ),
     )
 
     def __repr__(self) -> str:
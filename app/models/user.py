@@ -6,7 +6,9 @@ User model.
 Design decisions:
 - NO role-specific columns here (operator shift, client company, etc.)
   Those live in OperatorProfile / Client — referenced via one-to-one.
-- Status is an ENUM (INVITED → ACTIVE → DISABLED).
+- Status (INVITED → ACTIVE → DISABLED) is stored as VARCHAR with a
+  CHECK constraint rather than a PostgreSQL enum type — no enum codec
+  on reads, and no `ALTER TYPE` to add a value.
 - Roles are attached via a many-to-many so new roles can be added
   without schema changes.
 """
@@ -14,7 +16,7 @@ Design decisions:
 import enum
 import uuid
 
-from sqlalchemy import Enum, String
+from sqlalchemy import Enum, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
@@ -36,15 +38,34 @@ class UserStatus(str, enum.Enum):
 
 class User(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     __tablename__ = "users"
+    __table_args__ = (
+        # Unique on email, carrying what login reads so the lookup can be
+        # an index-only scan.
+        Index(
+            "ix_users_email",
+            "email",
+            unique=True,
+            postgresql_include=["id", "password_hash", "status"],
+        ),
+        # Keyset pagination for the admin user list.
+        Index("ix_users_created", "created_at", "id"),
+    )
 
-    email: Mapped[str] = mapped_column(String(256), unique=True, index=True, nullable=False)
+    email: Mapped[str] = mapped_column(String(256), nullable=False)
     password_hash: Mapped[str] = mapped_column(String(512), nullable=True)  # null while INVITED
     full_name: Mapped[str] = mapped_column(String(256), nullable=False)
     phone: Mapped[str | None] = mapped_column(String(32), nullable=True)
     address: Mapped[str | None] = mapped_column(String(512), nullable=True)
     status: Mapped[UserStatus] = mapped_column(
-        Enum(UserStatus, name="user_status"),
+        Enum(
+            UserStatus,
+            name="ck_users_status",
+            native_enum=False,
+            length=16,
+            create_constraint=True,
+        ),
         default=UserStatus.INVITED,
+        server_default=UserStatus.INVITED.value,
         nullable=False,
     )
 
@@ -52,18 +73,18 @@ class User(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     roles: Mapped[list["Role"]] = relationship(  # noqa: F821
         secondary=user_roles,
         back_populates="users",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
     operator_profile: Mapped["OperatorProfile | None"] = relationship(  # noqa: F821
         back_populates="user",
         uselist=False,
-        lazy="selectin",
+        lazy="raise_on_sql",
         cascade="all, delete-orphan",
     )
     client: Mapped["Client | None"] = relationship(  # noqa: F821
         back_populates="user",
         uselist=False,
-        lazy="selectin",
+        lazy="raise_on_sql",
         cascade="all, delete-orphan",
         foreign_keys="[Client.user_id]",
     )
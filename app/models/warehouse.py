@@ -35,11 +35,11 @@ class Warehouse(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     # ── Relationships ────────────────────────────────────────────────
     created_by_admin: Mapped["User | None"] = relationship(  # noqa: F821
         foreign_keys=[created_by_admin_id],
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
     operator_profiles: Mapped[list["OperatorProfile"]] = relationship(  # noqa: F821
         back_populates="warehouse",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
@@ -13,12 +13,16 @@ against the DB profile to prevent token tampering.
 Usage in a service:
     scope = await resolve_data_scope(current_user, db)
     query = query.where(SomeModel.warehouse_id == scope.warehouse_id)
+
+Controllers get the same scope, computed once per request, via
+`app.rbac.dependencies.get_data_scope`.
 """
 
 import uuid
 from dataclasses import dataclass, field
 
 from fastapi import HTTPException, status
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
@@ -41,12 +45,20 @@ class DataScope:
     role_names: set[str] = field(default_factory=set)
 
 
+async def _ensure_loaded(user: User, key: str, db: AsyncSession) -> None:
+    """Load a profile relationship the user's query didn't include."""
+    if key in sa_inspect(user).unloaded:
+        await db.refresh(user, [key])
+
+
 async def resolve_data_scope(user: User, db: AsyncSession) -> DataScope:
     """
     Build a DataScope from the authenticated user's profile.
 
     This is called inside every service method that touches
-    warehouse- or client-scoped data.
+    warehouse- or client-scoped data.  Only ``user.roles`` must be
+    loaded; the operator / client profile is fetched here, and only for
+    the role that needs it.
     """
     role_names = {role.name for role in user.roles}
 
@@ -62,6 +74,7 @@ async def resolve_data_scope(user: User, db: AsyncSession) -> DataScope:
 
     # Operator → locked to their warehouse
     if "OPERATOR" in role_names or "INVENTORY_MANAGER" in role_names:
+        await _ensure_loaded(user, "operator_profile", db)
         if user.operator_profile is None:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -72,6 +85,7 @@ async def resolve_data_scope(user: User, db: AsyncSession) -> DataScope:
 
     # Client → locked to their client record
     if "CLIENT" in role_names:
+        await _ensure_loaded(user, "client", db)
         if user.client is None:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
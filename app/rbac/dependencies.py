@@ -5,66 +5,104 @@ RBAC dependencies — the heart of permission enforcement.
 more permission codes and it returns a FastAPI dependency that will:
 
 1. Decode the JWT (via `get_current_user_token`).
-2. Load the full User (with roles → permissions eagerly loaded).
-3. Aggregate every permission code the user holds.
-4. Verify the required code(s) are present.
-5. Return 403 on failure — with NO details about which permissions
-   exist (prevents enumeration attacks).
+2. Take the caller's role ids from the loaded User — or, for
+   ``load_user=False`` routes, straight from the token's ``role_ids``
+   claim.
+3. Resolve those roles to permission codes through the per-worker
+   `permission_cache` — no role → permission join per request.
+4. Return 403 unless every required code is granted — with NO details
+   about which permissions exist (prevents enumeration attacks).
 
 Usage in a route:
-    @router.get("/items", dependencies=[Depends(require_permission("inventory.view"))])
+    @router.get(
+        "/items",
+        dependencies=[Depends(require_permission("inventory.view", load_user=False))],
+    )
     async def list_items(...): ...
 
 Or inject the user object:
     @router.get("/me")
     async def me(user: User = Depends(require_permission("inventory.view"))): ...
+
+The user is loaded once per request by `get_current_user` and stashed
+on ``request.state``, so other user dependencies reuse it and
+`get_data_scope` can build the caller's DataScope without reloading
+anything:
+    async def items(
+        user: User = Depends(require_permission("inventory.view")),
+        scope: DataScope = Depends(get_data_scope),
+    ): ...
 """
 
 import logging
 import uuid
 from typing import Any
 
-from fastapi import Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import ScalarSelect, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
 
 from app.core.database import get_db
 from app.core.security import get_current_user_token
-from app.models.role import Role
-from app.models.user import User
+from app.models.role import user_roles
+from app.models.user import User, UserStatus
+from app.rbac.context_resolver import DataScope, resolve_data_scope
+from app.rbac.permission_cache import get_permission_codes
 
 logger = logging.getLogger("rbac")
 
 
-async def _load_user_with_permissions(
-    user_id: uuid.UUID,
-    db: AsyncSession,
-) -> User:
-    """Fetch the user and eagerly load roles → permissions in one query."""
-    stmt = (
-        select(User)
-        .options(
-            selectinload(User.roles).selectinload(Role.permissions),
-            selectinload(User.operator_profile),
-            selectinload(User.client),
-        )
-        .where(User.id == user_id)
-    )
+async def _load_user(user_id: uuid.UUID, db: AsyncSession) -> User:
+    """
+    Fetch the user with their roles in one round-trip.
+
+    Roles are JOINed rather than selectin-loaded: a user has one to
+    three, so the extra rows cost less than a second query on every
+    request.  The operator / client profile is left unloaded —
+    `resolve_data_scope` fetches whichever one the user's role needs,
+    so admin traffic never pays for either.
+    """
+    stmt = select(User).options(joinedload(User.roles)).where(User.id == user_id)
     result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    user = result.unique().scalar_one_or_none()
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     return user
 
 
-def _collect_permission_codes(user: User) -> set[str]:
-    """Flatten roles → permissions into a set of code strings."""
-    codes: set[str] = set()
-    for role in user.roles:
-        for perm in role.permissions:
-            codes.add(perm.code)
-    return codes
+async def get_current_user(
+    request: Request,
+    token_payload: dict[str, Any] = Depends(get_current_user_token),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """
+    The authenticated User — the only place it is loaded.
+
+    Memoised on ``request.state.current_user``, so a route combining
+    several user-returning dependencies still issues one SELECT.  Status
+    and permissions are checked by the dependencies built on top.
+    """
+    user: User | None = getattr(request.state, "current_user", None)
+    if user is None:
+        user_id = token_payload.get("user_id")
+        if not user_id:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token payload",
+            )
+        user = await _load_user(uuid.UUID(user_id), db)
+        request.state.current_user = user
+    return user
+
+
+def _role_ids_of(user_id: uuid.UUID) -> ScalarSelect[list[uuid.UUID] | None]:
+    """The user's role ids as one array column (NULL when they have none)."""
+    return (
+        select(func.array_agg(user_roles.c.role_id))
+        .where(user_roles.c.user_id == user_id)
+        .scalar_subquery()
+    )
 
 
 class require_permission:
@@ -74,38 +112,74 @@ class require_permission:
     Can be used as:
         Depends(require_permission("inventory.view"))
         Depends(require_permission("billing.invoice.create", "billing.invoice.approve"))
+
+    Only the user's role ids are read per request; their permission
+    codes come from `permission_cache`.  With ``load_user=False`` the
+    dependency returns ``None`` and takes the role ids from the token's
+    signed ``role_ids`` claim, so it normally runs without touching the
+    database — use that for routes that only need the gate (and don't
+    use `get_data_scope`).  Tokens without the claim fall back to
+    selecting status and role ids.
+
+    The claim is a snapshot taken at login / refresh: on ``load_user=False``
+    routes a change to the user's role assignments only applies once the
+    access token is reissued — at most ``ACCESS_TOKEN_EXPIRE_MINUTES``
+    later.  Revoking the user's sessions (force-logout, disable) still
+    takes effect on the next request.
     """
 
-    def __init__(self, *permission_codes: str):
-        self.required_codes = set(permission_codes)
+    def __init__(self, *permission_codes: str, load_user: bool = True):
+        self.required_codes = frozenset(permission_codes)
+        self.load_user = load_user
 
     async def __call__(
         self,
+        request: Request,
         token_payload: dict[str, Any] = Depends(get_current_user_token),
         db: AsyncSession = Depends(get_db),
-    ) -> User:
+    ) -> User | None:
         user_id = token_payload.get("user_id")
         if not user_id:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token payload",
             )
-
-        user = await _load_user_with_permissions(uuid.UUID(user_id), db)
+        uid = uuid.UUID(user_id)
+
+        user: User | None = None
+        user_status: UserStatus | None = None
+        claimed_role_ids: list[str] | None = token_payload.get("role_ids")
+        if self.load_user:
+            user = await get_current_user(request, token_payload, db)
+            user_status = user.status
+            role_ids = [role.id for role in user.roles]
+        elif claimed_role_ids is not None:
+            # Gate-only route: trust the signed role claim (stale by at
+            # most one access-token lifetime).  Disabled users never get
+            # here — disabling deactivates every session, which
+            # `get_current_user_token` has already checked.
+            role_ids = [uuid.UUID(role_id) for role_id in claimed_role_ids]
+        else:
+            stmt = select(User.status, _role_ids_of(uid)).where(User.id == uid)
+            row = (await db.execute(stmt)).one_or_none()
+            if row is None:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+            user_status, role_ids = row[0], row[1] or ()
 
         # Disabled users must never pass
-        if user.status.value == "DISABLED":
+        if user_status == UserStatus.DISABLED:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Account disabled",
             )
 
-        granted = _collect_permission_codes(user)
+        granted = await get_permission_codes(db, role_ids)
 
-        if not self.required_codes.issubset(granted):
+        if not self.required_codes <= granted:
+            # Arguments are only formatted if the record is emitted.
             logger.warning(
                 "Permission denied for user %s — required: %s, granted: %s",
-                user.id,
+                uid,
                 self.required_codes,
                 granted,
             )
@@ -118,22 +192,36 @@ class require_permission:
         return user
 
 
-async def get_current_active_user(
-    token_payload: dict[str, Any] = Depends(get_current_user_token),
-    db: AsyncSession = Depends(get_db),
-) -> User:
+async def get_current_active_user(user: User = Depends(get_current_user)) -> User:
     """Dependency that returns the current user WITHOUT permission checks.
     Useful for routes that only need authentication, not authorization."""
-    user_id = token_payload.get("user_id")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-        )
-    user = await _load_user_with_permissions(uuid.UUID(user_id), db)
-    if user.status.value == "DISABLED":
+    if user.status == UserStatus.DISABLED:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Account disabled",
         )
     return user
+
+
+async def get_data_scope(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+) -> DataScope:
+    """
+    Dependency returning the caller's DataScope, memoised on
+    ``request.state``.
+
+    Must be declared AFTER `require_permission` / `get_current_active_user`
+    in the route signature — FastAPI resolves dependencies in order, and
+    the user those dependencies load is what the scope is built from.
+    """
+    scope: DataScope | None = getattr(request.state, "data_scope", None)
+    if scope is None:
+        user: User | None = getattr(request.state, "current_user", None)
+        if user is None:
+            raise RuntimeError(
+                "get_data_scope used without an authenticating dependency before it"
+            )
+        scope = await resolve_data_scope(user, db)
+        request.state.data_scope = scope
+    return scope
@@ -0,0 +1,101 @@
+"""
+Per-worker cache of role → permission codes (and role name → id).
+
+Permissions and their role mappings only change when the seed runs, so
+re-joining `role_permissions → permissions` on every request is wasted
+work.  PostgreSQL stays the source of truth:
+
+- Entries live in a `TTLCache` for ``RBAC_CACHE_TTL_SECONDS``.
+- The seed bumps the `rbac_version` row.  Workers re-read it at most
+  every ``RBAC_VERSION_CHECK_SECONDS`` and clear the cache when it has
+  moved, so a re-seed is picked up within seconds rather than a TTL.
+- A user's *role assignments* are never cached here — callers pass the
+  role ids they read for the current request.
+"""
+
+import time
+import uuid
+from collections.abc import Collection
+
+from cachetools import TTLCache
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.permission import Permission, rbac_version
+from app.models.role import Role, role_permissions
+
+_role_codes: TTLCache[uuid.UUID, frozenset[str]] = TTLCache(
+    maxsize=1024,
+    ttl=settings.RBAC_CACHE_TTL_SECONDS,
+)
+_role_ids: TTLCache[str, uuid.UUID] = TTLCache(
+    maxsize=64,
+    ttl=settings.RBAC_CACHE_TTL_SECONDS,
+)
+_version: int | None = None
+_version_checked_at = 0.0
+
+
+async def _check_version(db: AsyncSession) -> None:
+    global _version, _version_checked_at
+    now = time.monotonic()
+    if now - _version_checked_at < settings.RBAC_VERSION_CHECK_SECONDS:
+        return
+    version = await db.scalar(select(rbac_version.c.version))
+    if version != _version:
+        _role_codes.clear()
+        _role_ids.clear()
+        _version = version
+    _version_checked_at = now
+
+
+async def get_permission_codes(
+    db: AsyncSession,
+    role_ids: Collection[uuid.UUID],
+) -> frozenset[str]:
+    """Union of the permission codes granted by ``role_ids``."""
+    await _check_version(db)
+
+    codes: dict[uuid.UUID, frozenset[str]] = {}
+    missing: list[uuid.UUID] = []
+    for role_id in role_ids:
+        cached = _role_codes.get(role_id)
+        if cached is None:
+            missing.append(role_id)
+        else:
+            codes[role_id] = cached
+
+    if missing:
+        stmt = (
+            select(role_permissions.c.role_id, Permission.code)
+            .join(Permission, Permission.id == role_permissions.c.permission_id)
+            .where(role_permissions.c.role_id.in_(missing))
+        )
+        loaded: dict[uuid.UUID, set[str]] = {role_id: set() for role_id in missing}
+        for role_id, code in await db.execute(stmt):
+            loaded[role_id].add(code)
+        for role_id, role_codes in loaded.items():
+            codes[role_id] = _role_codes[role_id] = frozenset(role_codes)
+
+    return frozenset().union(*codes.values())
+
+
+async def get_role_id(db: AsyncSession, name: str) -> uuid.UUID | None:
+    """Id of the role called ``name``, or ``None`` if it does not exist."""
+    await _check_version(db)
+
+    role_id = _role_ids.get(name)
+    if role_id is None:
+        role_id = await db.scalar(select(Role.id).where(Role.name == name))
+        if role_id is not None:
+            _role_ids[name] = role_id
+    return role_id
+
+
+def clear() -> None:
+    """Drop every cached entry (e.g. after seeding in-process)."""
+    global _version_checked_at
+    _role_codes.clear()
+    _role_ids.clear()
+    _version_checked_at = 0.0
@@ -10,50 +10,61 @@ Governance rule enforced here:
     • Only ADMIN holds every permission
 
 Usage:
-    python -m app.rbac.permission_seed
+    python -m app.rbac.permission_seed [--force]
+
+Re-running an unchanged seed is a no-op; ``--force`` repairs anyway.
 """
 
 import asyncio
-import uuid
+import hashlib
+import json
+import sys
+from typing import NamedTuple
 
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
-from app.models.base import Base
-from app.models.permission import Permission
-from app.models.role import Role
+from app.core.database import async_session_factory, engine
+from app.models import Base, register_all
+from app.models.permission import Permission, rbac_version
+from app.models.role import Role, role_permissions
+from app.rbac import permission_cache
 
 # ────────────────────────────────────────────────────────────────────
 # 1.  CANONICAL PERMISSION LIST
 # ────────────────────────────────────────────────────────────────────
-PERMISSIONS: list[dict[str, str]] = [
+class Perm(NamedTuple):
+    code: str
+    description: str
+
+
+PERMISSIONS: tuple[Perm, ...] = (
     # Inventory
-    {"code": "inventory.inward.create", "description": "Create inward inventory entries"},
-    {"code": "inventory.zone.allocate", "description": "Allocate inventory to a zone"},
-    {"code": "inventory.move.internal", "description": "Move inventory between zones"},
-    {"code": "inventory.dispatch.execute", "description": "Execute dispatch of inventory"},
-    {"code": "inventory.view", "description": "View inventory data"},
+    Perm("inventory.inward.create", "Create inward inventory entries"),
+    Perm("inventory.zone.allocate", "Allocate inventory to a zone"),
+    Perm("inventory.move.internal", "Move inventory between zones"),
+    Perm("inventory.dispatch.execute", "Execute dispatch of inventory"),
+    Perm("inventory.view", "View inventory data"),
     # Billing
-    {"code": "billing.invoice.create", "description": "Create invoices"},
-    {"code": "billing.invoice.approve", "description": "Approve invoices (governance-separated)"},
-    {"code": "invoice.view", "description": "View invoices"},
+    Perm("billing.invoice.create", "Create invoices"),
+    Perm("billing.invoice.approve", "Approve invoices (governance-separated)"),
+    Perm("invoice.view", "View invoices"),
     # User management
-    {"code": "user.invite.operator", "description": "Invite an operator"},
-    {"code": "user.invite.client", "description": "Invite a client"},
+    Perm("user.invite.operator", "Invite an operator"),
+    Perm("user.invite.client", "Invite a client"),
     # Warehouse
-    {"code": "warehouse.create", "description": "Create a warehouse"},
-    {"code": "warehouse.update", "description": "Update warehouse details"},
+    Perm("warehouse.create", "Create a warehouse"),
+    Perm("warehouse.update", "Update warehouse details"),
     # Storage hierarchy (rooms & racks)
-    {"code": "room.create", "description": "Create a room inside a warehouse"},
-    {"code": "rack.create", "description": "Create a rack inside a room"},
+    Perm("room.create", "Create a room inside a warehouse"),
+    Perm("rack.create", "Create a rack inside a room"),
     # Temperature zones
-    {"code": "temperature.zone.create", "description": "Create global temperature zones"},
-    {"code": "temperature.zone.view", "description": "View global temperature zones"},
-    {"code": "temperature.zone.update", "description": "Update global temperature zones"},
-    {"code": "temperature.zone.delete", "description": "Delete global temperature zones"},
-]
+    Perm("temperature.zone.create", "Create global temperature zones"),
+    Perm("temperature.zone.view", "View global temperature zones"),
+    Perm("temperature.zone.update", "Update global temperature zones"),
+    Perm("temperature.zone.delete", "Delete global temperature zones"),
+)
 
 # ────────────────────────────────────────────────────────────────────
 # 2.  ROLE → PERMISSION MAPPING
@@ -61,9 +72,11 @@ PERMISSIONS: list[dict[str, str]] = [
 #     Governance: inventory mutation and billing approval are
 #     NEVER combined in the same non-admin role.
 # ────────────────────────────────────────────────────────────────────
-ROLE_PERMISSIONS: dict[str, list[str]] = {
-    "ADMIN": [p["code"] for p in PERMISSIONS],  # full access
-    "OPERATOR": [
+_ALL_CODES: tuple[str, ...] = tuple(p.code for p in PERMISSIONS)
+
+ROLE_PERMISSIONS: dict[str, tuple[str, ...]] = {
+    "ADMIN": _ALL_CODES,  # full access
+    "OPERATOR": (
         "inventory.inward.create",
         "inventory.zone.allocate",
         "inventory.move.internal",
@@ -73,8 +86,8 @@ ROLE_PERMISSIONS: dict[str, list[str]] = {
         "temperature.zone.view",
         "temperature.zone.update",
         "temperature.zone.delete",
-    ],
-    "INVENTORY_MANAGER": [
+    ),
+    "INVENTORY_MANAGER": (
         "inventory.inward.create",
         "inventory.zone.allocate",
         "inventory.move.internal",
@@ -85,74 +98,103 @@ ROLE_PERMISSIONS: dict[str, list[str]] = {
         "temperature.zone.update",
         "temperature.zone.delete",
         # NOTE: No billing.invoice.approve here — governance rule
-    ],
-    "BILLING_MANAGER": [
+    ),
+    "BILLING_MANAGER": (
         "billing.invoice.create",
         "billing.invoice.approve",
         "invoice.view",
         # NOTE: No inventory mutation permissions — governance rule
-    ],
-    "CLIENT": [
+    ),
+    "CLIENT": (
         "inventory.view",
         "invoice.view",
-    ],
+    ),
 }
 
+# (role name, permission code) links, flattened once for the seed's
+# INSERT … SELECT into role_permissions.
+ROLE_PERMISSION_PAIRS: tuple[tuple[str, str], ...] = tuple(
+    (role, code) for role, codes in ROLE_PERMISSIONS.items() for code in codes
+)
+
+# Fingerprint of PERMISSIONS + ROLE_PERMISSIONS.  Stored in `rbac_version` after a
+# successful run, so re-running an unchanged seed is a single SELECT.
+SEED_HASH = hashlib.sha256(
+    json.dumps(
+        {"permissions": [p._asdict() for p in PERMISSIONS], "roles": ROLE_PERMISSIONS},
+        sort_keys=True,
+    ).encode()
+).hexdigest()
+
+# Serialises concurrent seed runs (e.g. several replicas deploying).
+_SEED_LOCK_KEY = 0x5EED_4BAC
+
 
 # ────────────────────────────────────────────────────────────────────
 # 3.  SEED FUNCTION (idempotent)
 # ────────────────────────────────────────────────────────────────────
-async def seed(session: AsyncSession) -> None:
-    """Create/repair permissions, roles, and role-permission links idempotently."""
+async def _applied_seed_hash(session: AsyncSession) -> str | None:
+    return await session.scalar(select(rbac_version.c.seed_hash))
 
-    existing_perms = (await session.execute(select(Permission))).scalars().all()
-    existing_codes = {p.code for p in existing_perms}
 
-    existing_roles = (
-        await session.execute(select(Role).options(selectinload(Role.permissions)))
-    ).scalars().all()
-    existing_role_names = {r.name for r in existing_roles}
+async def seed(session: AsyncSession, *, force: bool = False) -> None:
+    """
+    Create/repair permissions, roles, and role-permission links idempotently.
 
-    code_to_perm: dict[str, Permission] = {p.code: p for p in existing_perms}
-    name_to_role: dict[str, Role] = {r.name: r for r in existing_roles}
+    Skipped when the stored seed hash already matches ``SEED_HASH``
+    (pass ``force=True`` to repair regardless).  The writes run under a
+    transaction-scoped advisory lock, so concurrent runs apply it once.
+    """
+    if not force and await _applied_seed_hash(session) == SEED_HASH:
+        print("✔  Permission seed already applied — nothing to do.")
+        return
 
-    # ── Permissions ───────────────────────────────────────────────────
-    for pdata in PERMISSIONS:
-        if pdata["code"] not in existing_codes:
-            perm = Permission(id=uuid.uuid4(), **pdata)
-            session.add(perm)
-            code_to_perm[pdata["code"]] = perm
+    await session.execute(select(func.pg_advisory_xact_lock(_SEED_LOCK_KEY)))
+    # Another run may have finished while we waited for the lock.
+    if not force and await _applied_seed_hash(session) == SEED_HASH:
+        await session.commit()
+        print("✔  Permission seed already applied — nothing to do.")
+        return
 
-    await session.flush()  # ensure IDs are available
+    # Each stage is one multi-row INSERT … ON CONFLICT DO NOTHING, so
+    # existing rows are left alone and nothing is read back first.
 
-    # ── Roles (create missing) ───────────────────────────────────────
-    for role_name, perm_codes in ROLE_PERMISSIONS.items():
-        if role_name in existing_role_names:
-            continue
-
-        role = Role(
-            id=uuid.uuid4(),
-            name=role_name,
-            description=f"Default {role_name} role",
-        )
-        session.add(role)
-        name_to_role[role_name] = role
+    # ── Permissions ───────────────────────────────────────────────────
+    await session.execute(
+        pg_insert(Permission.__table__)
+        .values([p._asdict() for p in PERMISSIONS])
+        .on_conflict_do_nothing(index_elements=["code"])
+    )
 
-    await session.flush()
+    # ── Roles (create missing) ───────────────────────────────────────
+    await session.execute(
+        pg_insert(Role.__table__)
+        .values([{"name": name, "description": f"Default {name} role"} for name in ROLE_PERMISSIONS])
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
 
     # ── Role ↔ Permission links (backfill missing associations) ──────
-    for role_name, perm_codes in ROLE_PERMISSIONS.items():
-        role = name_to_role[role_name]
-        existing_role_perm_codes = {p.code for p in role.permissions}
-
-        for code in perm_codes:
-            if code in existing_role_perm_codes:
-                continue
-            perm_obj = code_to_perm.get(code)
-            if perm_obj:
-                role.permissions.append(perm_obj)
+    links = select(Role.id, Permission.id).join(
+        Permission, tuple_(Role.name, Permission.code).in_(ROLE_PERMISSION_PAIRS)
+    )
+    await session.execute(
+        pg_insert(role_permissions)
+        .from_select(["role_id", "permission_id"], links)
+        .on_conflict_do_nothing()
+    )
+
+    # ── Tell running workers their cached mappings are stale ─────────
+    await session.execute(
+        pg_insert(rbac_version)
+        .values(id=1, version=1, seed_hash=SEED_HASH)
+        .on_conflict_do_update(
+            index_elements=[rbac_version.c.id],
+            set_={"version": rbac_version.c.version + 1, "seed_hash": SEED_HASH},
+        )
+    )
 
     await session.commit()
+    permission_cache.clear()
     print("✔  Permissions, roles, and role-permission mappings seeded successfully.")
 
 
@@ -160,12 +202,11 @@ async def seed(session: AsyncSession) -> None:
 # 4.  CLI entrypoint:  python -m app.rbac.permission_seed
 # ────────────────────────────────────────────────────────────────────
 async def main() -> None:
-    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+    register_all()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-    async_session = async_sessionmaker(engine, expire_on_commit=False)
-    async with async_session() as session:
-        await seed(session)
+    async with async_session_factory() as session:
+        await seed(session, force="--force" in sys.argv)
     await engine.dispose()
 
 
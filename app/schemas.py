@@ -10,7 +10,7 @@ import uuid
 from datetime import datetime, time
 from enum import Enum
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
 
 
 # ── Auth ─────────────────────────────────────────────────────────────
@@ -62,6 +62,12 @@ class UserOut(BaseModel):
 
     model_config = {"from_attributes": True}
 
+    @field_validator("roles", mode="before")
+    @classmethod
+    def _role_names(cls, value: list) -> list:
+        """Accept ORM ``Role`` objects as well as plain role names."""
+        return [getattr(role, "name", role) for role in value]
+
 
 # ── Invitation ───────────────────────────────────────────────────────
 class CreateInvitationRequest(BaseModel):
@@ -73,7 +79,8 @@ class InvitationOut(BaseModel):
     id: uuid.UUID
     email: str
     role_assigned: str
-    token: str
+    # Only the digest is stored, so the token is returned on creation only.
+    token: str | None = None
     status: str
     expires_at: datetime
     created_at: datetime
@@ -10,23 +10,19 @@ users are created via the invitation flow.
 
 import asyncio
 import getpass
-import uuid
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy import insert, select
 
-from app.core.config import settings
+from app.core.database import async_session_factory, engine
 from app.core.security import hash_password
-from app.models.base import Base
-from app.models.role import Role
+from app.models import register_all
+from app.models.role import Role, user_roles
 from app.models.user import User, UserStatus
 
 
 async def create_admin() -> None:
-    engine = create_async_engine(settings.DATABASE_URL, echo=False)
-    session_factory = async_sessionmaker(engine, expire_on_commit=False)
-
-    async with session_factory() as session:
+    register_all()
+    async with async_session_factory() as session:
         # ── Collect input ────────────────────────────────────────────
         print("\n🔧  CMS Backend — First Admin Setup\n")
         email = input("  Admin email: ").strip()
@@ -44,42 +40,43 @@ async def create_admin() -> None:
             await engine.dispose()
             return
 
-        # ── Check for existing user ──────────────────────────────────
-        existing = (
-            await session.execute(select(User).where(User.email == email))
-        ).scalar_one_or_none()
+        # ── Check for existing user + find ADMIN role (one query) ────
+        lookup = select(
+            select(User.id).where(User.email == email).exists().label("email_taken"),
+            select(Role.id).where(Role.name == "ADMIN").scalar_subquery().label("admin_role_id"),
+        )
+        email_taken, admin_role_id = (await session.execute(lookup)).one()
 
-        if existing:
+        if email_taken:
             print(f"\n❌  User with email '{email}' already exists.")
             await engine.dispose()
             return
 
-        # ── Find ADMIN role (must be seeded first) ───────────────────
-        admin_role = (
-            await session.execute(select(Role).where(Role.name == "ADMIN"))
-        ).scalar_one_or_none()
-
-        if admin_role is None:
-            print("\n❌  ADMIN role not found. Start the app once first so")
-            print("   permissions & roles get seeded, then re-run this script.")
+        if admin_role_id is None:
+            print("\n❌  ADMIN role not found. Run `python -m app.rbac.permission_seed`")
+            print("   so permissions & roles get seeded, then re-run this script.")
             await engine.dispose()
             return
 
         # ── Create the admin user ────────────────────────────────────
-        admin_user = User(
-            id=uuid.uuid4(),
-            email=email,
-            password_hash=hash_password(password),
-            full_name=full_name,
-            status=UserStatus.ACTIVE,
+        admin_id = await session.scalar(
+            insert(User)
+            .values(
+                email=email,
+                password_hash=hash_password(password),
+                full_name=full_name,
+                status=UserStatus.ACTIVE,
+            )
+            .returning(User.id)
+        )
+        await session.execute(
+            insert(user_roles).values(user_id=admin_id, role_id=admin_role_id)
         )
-        admin_user.roles.append(admin_role)
-        session.add(admin_user)
         await session.commit()
 
         print(f"\n✅  Admin user created successfully!")
-        print(f"    ID:    {admin_user.id}")
-        print(f"    Email: {admin_user.email}")
+        print(f"    ID:    {admin_id}")
+        print(f"    Email: {email}")
         print(f"    Role:  ADMIN")
         print(f"\n   You can now log in via POST /api/auth/login\n")
 
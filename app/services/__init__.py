@@ -0,0 +1,9 @@
+"""
+Service layer.
+
+Services build some statements at import time, and loader options such
+as ``load_only()`` configure the mappers — so every model has to be
+registered (``app.models.register_all()``) before any service module
+loads.  `create_app()` and the CLI scripts do that; importing this
+package does not.
+"""
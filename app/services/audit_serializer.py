@@ -6,7 +6,7 @@ storing in the audit_log JSONB columns (old_data / new_data).
 
 Rules:
 - Include scalar (column) attributes only.
-- Convert UUID → str, Decimal → str, datetime → ISO 8601.
+- Convert UUID → str, Decimal → str, datetime → ISO 8601, bytes → hex.
 - Exclude relationships, large blobs, and secrets.
 - Output must be deterministic and JSON-serialisable.
 """
@@ -25,7 +25,7 @@ _EXCLUDED_COLUMNS: frozenset[str] = frozenset(
     {
         "password_hash",
         "refresh_token_hash",
-        "token",  # invitation secret
+        "token_hash",  # invitation secret (digest)
     }
 )
 
@@ -44,6 +44,8 @@ def _serialise_value(value: Any) -> Any:
         return value.isoformat()
     if isinstance(value, Enum):
         return value.value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
     # str / int / float / bool — already JSON-safe
     return value
 
@@ -73,7 +73,6 @@ async def log(
         action = AuditAction(action)
 
     entry = AuditLog(
-        id=uuid.uuid4(),
         entity_type=entity_type,
         entity_id=entity_id,
         action=action,
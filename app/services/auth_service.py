@@ -20,33 +20,41 @@ and return the result.
 """
 
 import hashlib
+import hmac
 import random
 import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from functools import cached_property
 from datetime import datetime, time, timedelta, timezone
 
+import jwt
 from fastapi import HTTPException, status
-from jose import JWTError, jwt
-from sqlalchemy import func, select
+from sqlalchemy import Row, Select, and_, bindparam, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.core.config import settings
 from app.core.security import (
     create_access_token,
     create_refresh_token,
-    decode_access_token,
-    hash_password,
+    digest_token,
+    hash_password_async,
     hash_token,
-    verify_password,
+    password_needs_rehash,
+    verify_dummy_password_async,
+    verify_password_async,
 )
+from app.models.client import Client
 from app.models.invitation import Invitation, InvitationStatus
 from app.models.operator_profile import OperatorProfile
 from app.models.password_reset_otp import PasswordResetOTP
-from app.models.role import Role
+from app.models.role import Role, user_roles
 from app.models.session import UserSession
 from app.models.user import User, UserStatus
 from app.models.warehouse import Warehouse
 from app.models.enums import AuditAction
+from app.rbac import permission_cache
 from app.services import audit_service, session_service
 from app.services.audit_serializer import to_audit_dict
 from app.services import product_service
@@ -54,40 +62,112 @@ from app.services import product_service
 
 # ── Helpers ──────────────────────────────────────────────────────────
 
-def _build_access_payload(user: User, *, session_id: str, device_id: str) -> dict:
+@dataclass
+class _TokenSubject:
+    """The columns login / refresh need to mint tokens — no ORM state."""
+
+    user_id: uuid.UUID
+    password_hash: str | None
+    status: UserStatus
+    role_ids: list[uuid.UUID] = field(default_factory=list)
+    role_names: list[str] = field(default_factory=list)
+    warehouse_id: uuid.UUID | None = None
+    client_id: uuid.UUID | None = None
+
+    @cached_property
+    def user_id_str(self) -> str:
+        """``str(user_id)`` — it appears in both tokens and the response."""
+        return str(self.user_id)
+
+
+# Built once at import and executed with bound parameters (same pattern
+# as session_service), so login / refresh hit SQLAlchemy's compiled
+# cache and asyncpg's per-connection prepared statement.
+#
+# The user row is LEFT JOINed to its roles, operator profile and client.
+# Profile and client are one-to-one, so the only fan-out is one row per
+# role.
+_token_subject_stmt = (
+    select(
+        User.id,
+        User.password_hash,
+        User.status,
+        Role.id,
+        Role.name,
+        OperatorProfile.warehouse_id,
+        Client.id,
+    )
+    .select_from(User)
+    .outerjoin(user_roles, user_roles.c.user_id == User.id)
+    .outerjoin(Role, Role.id == user_roles.c.role_id)
+    .outerjoin(OperatorProfile, OperatorProfile.user_id == User.id)
+    .outerjoin(Client, Client.user_id == User.id)
+)
+_token_subject_by_email_stmt = _token_subject_stmt.where(User.email == bindparam("email"))
+# Refresh: the same columns plus the active session being rotated, so
+# session check and claims come back in one round-trip.  The inner join
+# yields no rows when the session is missing, inactive, or not the
+# user's.
+_refresh_subject_stmt = (
+    _token_subject_stmt.add_columns(UserSession.device_id, UserSession.refresh_token_hash)
+    .join(
+        UserSession,
+        and_(
+            UserSession.user_id == User.id,
+            UserSession.id == bindparam("session_id"),
+            UserSession.is_active == True,  # noqa: E712
+        ),
+    )
+    .where(User.id == bindparam("user_id"))
+)
+
+
+def _fold_token_subject(rows: Sequence[Row]) -> _TokenSubject:
+    """Collapse the one-row-per-role result of the statements above."""
+    user_id, password_hash, user_status, _, _, warehouse_id, client_id = rows[0][:7]
+    subject = _TokenSubject(
+        user_id=user_id,
+        password_hash=password_hash,
+        status=user_status,
+        warehouse_id=warehouse_id,
+        client_id=client_id,
+    )
+    for row in rows:
+        role_id, role_name = row[3], row[4]
+        if role_id is not None:
+            subject.role_ids.append(role_id)
+            subject.role_names.append(role_name)
+    return subject
+
+
+async def _load_token_subject(
+    db: AsyncSession,
+    stmt: Select,
+    params: dict,
+) -> _TokenSubject | None:
+    """Run one of the ``_token_subject_*`` statements and fold its rows."""
+    rows = (await db.execute(stmt, params)).all()
+    return _fold_token_subject(rows) if rows else None
+
+
+def _build_access_payload(subject: _TokenSubject, *, session_id: str, device_id: str) -> dict:
     """Construct the JWT payload, keeping backward-compat keys."""
-    role_names = [r.name for r in user.roles]
     payload: dict = {
-        "sub": str(user.id),
-        "user_id": str(user.id),           # backward compat
-        "role_ids": [str(r.id) for r in user.roles],
-        "role_names": role_names,
+        "sub": subject.user_id_str,
+        "user_id": subject.user_id_str,    # backward compat
+        "role_ids": [str(r) for r in subject.role_ids],
+        "role_names": subject.role_names,
         "device_id": device_id,
         "session_id": session_id,
     }
-    if user.operator_profile:
-        payload["warehouse_id"] = str(user.operator_profile.warehouse_id)
-    if user.client:
-        payload["client_id"] = str(user.client.id)
+    if subject.warehouse_id:
+        payload["warehouse_id"] = str(subject.warehouse_id)
+    if subject.client_id:
+        payload["client_id"] = str(subject.client_id)
     return payload
 
 
-async def _load_user_full(user_id: uuid.UUID, db: AsyncSession) -> User:
-    """Load user with roles, operator_profile, and client eagerly."""
-    stmt = (
-        select(User)
-        .options(
-            selectinload(User.roles),
-            selectinload(User.operator_profile),
-            selectinload(User.client),
-        )
-        .where(User.id == user_id)
-    )
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
-    if user is None:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+_SESSION_IDLE_TIMEOUT = timedelta(minutes=settings.SESSION_INACTIVITY_TIMEOUT_MINUTES)
 
 
 # ── Login ────────────────────────────────────────────────────────────
@@ -102,19 +182,12 @@ async def authenticate_user(
     Validate credentials, enforce device-concurrency rules, create or
     reuse a session, and return access + refresh tokens.
     """
-    stmt = (
-        select(User)
-        .options(
-            selectinload(User.roles),
-            selectinload(User.operator_profile),
-            selectinload(User.client),
-        )
-        .where(User.email == email)
-    )
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    user = await _load_token_subject(db, _token_subject_by_email_stmt, {"email": email})
 
-    if user is None or not verify_password(password, user.password_hash or ""):
+    if user is None:
+        # Same hashing cost as a real miss — no account enumeration
+        await verify_dummy_password_async(password)
+    if user is None or not await verify_password_async(password, user.password_hash or ""):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -126,46 +199,47 @@ async def authenticate_user(
             detail="Account is disabled",
         )
 
-    role_names = [r.name for r in user.roles]
+    # Upgrade legacy bcrypt (or outdated argon2) hashes transparently
+    if password_needs_rehash(user.password_hash):
+        await db.execute(
+            update(User)
+            .where(User.id == user.user_id)
+            .values(password_hash=await hash_password_async(password))
+        )
+
+    role_names = user.role_names
     now = datetime.now(timezone.utc)
-    timeout_seconds = settings.SESSION_INACTIVITY_TIMEOUT_MINUTES * 60
 
-    # ── Fetch active sessions & clean up timed-out ones ──────────────
-    active_sessions = await session_service.get_active_sessions(user.id, db)
+    # ── Clean up timed-out sessions, then fetch the live ones ────────
+    await session_service.gc_stale_sessions(
+        user.user_id, db, _SESSION_IDLE_TIMEOUT,
+    )
+    truly_active = await session_service.get_active_sessions(user.user_id, db)
 
-    truly_active: list[UserSession] = []
-    for sess in active_sessions:
-        if (now - sess.last_seen_at).total_seconds() > timeout_seconds:
-            sess.is_active = False          # garbage-collect stale session
-        else:
-            truly_active.append(sess)
+    by_device = {sess.device_id: sess for sess in truly_active}
 
     # ── Apply concurrency rules (all roles: one device at a time) ───
-    for sess in truly_active:
-        if sess.device_id != device_id:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Active session exists on another device. "
-                       "Only one device is allowed per user.",
-            )
+    if by_device.keys() - {device_id}:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Active session exists on another device. "
+                   "Only one device is allowed per user.",
+        )
 
     # ── Create or reuse session ──────────────────────────────────────
-    existing_session: UserSession | None = None
-    for sess in truly_active:
-        if sess.device_id == device_id:
-            existing_session = sess
-            break
+    existing_session: UserSession | None = by_device.get(device_id)
 
     session_id = existing_session.id if existing_session else uuid.uuid4()
+    session_id_str = str(session_id)
 
     # Build tokens
     access_payload = _build_access_payload(
-        user, session_id=str(session_id), device_id=device_id,
+        user, session_id=session_id_str, device_id=device_id,
     )
     access_token = create_access_token(access_payload)
     refresh_token = create_refresh_token({
-        "sub": str(user.id),
-        "session_id": str(session_id),
+        "sub": user.user_id_str,
+        "session_id": session_id_str,
         "device_id": device_id,
     })
     refresh_hash = hash_token(refresh_token)
@@ -176,7 +250,7 @@ async def authenticate_user(
     else:
         new_session = UserSession(
             id=session_id,
-            user_id=user.id,
+            user_id=user.user_id,
             device_id=device_id,
             role=role_names[0] if role_names else "UNKNOWN",
             refresh_token_hash=refresh_hash,
@@ -189,7 +263,7 @@ async def authenticate_user(
         "access_token": access_token,
         "refresh_token": refresh_token,
         "token_type": "bearer",
-        "user_id": str(user.id),
+        "user_id": user.user_id_str,
         "roles": role_names,
     }
 
@@ -201,12 +275,15 @@ async def refresh_access_token(refresh_token_raw: str, db: AsyncSession) -> dict
     Validate a refresh token, rotate it, and return new access + refresh
     tokens.
     """
+    # Encode once — both signature verification and the hash check
+    # work on the same bytes.
+    token_bytes = refresh_token_raw.encode("utf-8")
     try:
         payload = jwt.decode(
-            refresh_token_raw, settings.SECRET_KEY,
+            token_bytes, settings.SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM],
         )
-    except JWTError:
+    except jwt.PyJWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired refresh token",
@@ -226,54 +303,63 @@ async def refresh_access_token(refresh_token_raw: str, db: AsyncSession) -> dict
             detail="Invalid refresh token payload",
         )
 
-    session = await session_service.get_active_session_by_id(
-        uuid.UUID(session_id_str), db,
-    )
-    if session is None or str(session.user_id) != user_id_str:
+    session_id = uuid.UUID(session_id_str)
+    rows = (
+        await db.execute(
+            _refresh_subject_stmt,
+            {"session_id": session_id, "user_id": uuid.UUID(user_id_str)},
+        )
+    ).all()
+    if not rows:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Session not found or inactive",
         )
+    user = _fold_token_subject(rows)
+    device_id, stored_refresh_hash = rows[0][7:]
 
     # Verify refresh token hash
-    if session.refresh_token_hash != hash_token(refresh_token_raw):
+    if not hmac.compare_digest(stored_refresh_hash or "", hash_token(token_bytes)):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Refresh token does not match — possible reuse detected",
         )
 
-    # Load user and check status
-    user = await _load_user_full(uuid.UUID(user_id_str), db)
     if user.status == UserStatus.DISABLED:
-        await session_service.deactivate_session(session.id, db)
+        await session_service.deactivate_session(session_id, db)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Account is disabled",
         )
 
-    role_names = [r.name for r in user.roles]
+    role_names = user.role_names
 
     # Build rotated tokens
     new_access_payload = _build_access_payload(
-        user, session_id=str(session.id), device_id=session.device_id,
+        user, session_id=session_id_str, device_id=device_id,
     )
     new_access_token = create_access_token(new_access_payload)
     new_refresh_token = create_refresh_token({
-        "sub": str(user.id),
-        "session_id": str(session.id),
-        "device_id": session.device_id,
+        "sub": user.user_id_str,
+        "session_id": session_id_str,
+        "device_id": device_id,
     })
 
     # Rotate refresh token hash
-    session.refresh_token_hash = hash_token(new_refresh_token)
-    session.last_seen_at = datetime.now(timezone.utc)
-    await db.flush()
+    await db.execute(
+        update(UserSession)
+        .where(UserSession.id == session_id)
+        .values(
+            refresh_token_hash=hash_token(new_refresh_token),
+            last_seen_at=datetime.now(timezone.utc),
+        )
+    )
 
     return {
         "access_token": new_access_token,
         "refresh_token": new_refresh_token,
         "token_type": "bearer",
-        "user_id": str(user.id),
+        "user_id": user.user_id_str,
         "roles": role_names,
     }
 
@@ -291,47 +377,42 @@ async def accept_invitation(
     Accept an invitation: validate the token, create/activate the user,
     assign the designated role.
     """
-    stmt = select(Invitation).where(
-        Invitation.token == token,
+    token_hash = digest_token(token)
+    pending = (
+        Invitation.token_hash == token_hash,
         Invitation.status == InvitationStatus.PENDING,
     )
+    stmt = select(Invitation).where(*pending, Invitation.expires_at > func.now())
     result = await db.execute(stmt)
     invite = result.scalar_one_or_none()
 
     if invite is None:
+        # Miss path only: tell an expired link apart from an unknown one.
+        # (No EXPIRED write here — a 4xx response rolls the request back.)
+        expired = await db.scalar(select(Invitation.id).where(*pending))
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid or expired invitation",
-        )
-
-    if invite.expires_at < datetime.now(timezone.utc):
-        invite.status = InvitationStatus.EXPIRED
-        await db.flush()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invitation has expired",
+            detail="Invitation has expired" if expired else "Invalid or expired invitation",
         )
 
     # Find or create user
-    user_stmt = (
-        select(User)
-        .options(selectinload(User.roles))
-        .where(User.email == invite.email)
-    )
+    user_stmt = select(User).where(User.email == invite.email)
     user_result = await db.execute(user_stmt)
     user = user_result.scalar_one_or_none()
 
     if user is None:
-        user = User(
-            id=uuid.uuid4(),
-            email=invite.email,
-            full_name=full_name,
-            password_hash=hash_password(password),
-            status=UserStatus.ACTIVE,
+        # INSERT … RETURNING the entity: one statement, and the row comes
+        # back with its server-generated id / timestamps already loaded.
+        user = await db.scalar(
+            insert(User)
+            .values(
+                email=invite.email,
+                full_name=full_name,
+                password_hash=await hash_password_async(password),
+                status=UserStatus.ACTIVE,
+            )
+            .returning(User)
         )
-        db.add(user)
-        await db.flush()
-        await db.refresh(user, ["roles"])
 
         await audit_service.log(
             db,
@@ -343,24 +424,26 @@ async def accept_invitation(
             new_data=to_audit_dict(user),
         )
     else:
-        user.password_hash = hash_password(password)
+        user.password_hash = await hash_password_async(password)
         user.full_name = full_name
         user.status = UserStatus.ACTIVE
 
-    # Assign role
-    role_stmt = select(Role).where(Role.name == invite.role_assigned)
-    role_result = await db.execute(role_stmt)
-    role = role_result.scalar_one_or_none()
-    if role is None:
+    # Assign role — `user.roles` is reloaded once at the end
+    role_name = invite.role_assigned
+    role_id = await permission_cache.get_role_id(db, role_name)
+    if role_id is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Assigned role does not exist",
         )
-    if role not in user.roles:
-        user.roles.append(role)
+    await db.execute(
+        pg_insert(user_roles)
+        .values(user_id=user.id, role_id=role_id)
+        .on_conflict_do_nothing()
+    )
 
     # Create a new operator profile if the role is OPERATOR
-    if role.name == "OPERATOR":
+    if role_name == "OPERATOR":
         if warehouse_id is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -375,16 +458,13 @@ async def accept_invitation(
         db.add(operator_profile)
 
     # Create a client profile if the role is CLIENT
-    if role.name == "CLIENT":
-        from app.models.client import Client
-
+    if role_name == "CLIENT":
         existing_client = (
             await db.execute(select(Client).where(Client.user_id == user.id))
         ).scalar_one_or_none()
 
         if existing_client is None:
             client = Client(
-                id=uuid.uuid4(),
                 user_id=user.id,
                 company_name=full_name,  # default to user's name
                 created_by_admin_id=invite.invited_by,
@@ -401,7 +481,8 @@ async def accept_invitation(
             )
 
     invite.status = InvitationStatus.ACCEPTED
-    await db.flush()
+    # Only the role link (already INSERTed above) needs reading back;
+    # the remaining pending writes go out with the request's commit.
     await db.refresh(user, ["roles"])
 
     # Audit: role assignment
@@ -412,21 +493,34 @@ async def accept_invitation(
         action="UPDATE",
         performed_by=user.id,
         old_data=None,
-        new_data={"user_id": str(user.id), "role": role.name},
-        reason=f"Role '{role.name}' assigned via invitation acceptance",
+        new_data={"user_id": str(user.id), "role": role_name},
+        reason=f"Role '{role_name}' assigned via invitation acceptance",
     )
 
     return user
 
 async def get_invitation_by_token(token: str, db: AsyncSession) -> Invitation | None:
-    stmt = select(Invitation).where(Invitation.token == token)
+    stmt = select(Invitation).where(Invitation.token_hash == digest_token(token))
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
-async def get_all_warehouses(db: AsyncSession) -> list[Warehouse]:
-    stmt = select(Warehouse)
+async def get_all_warehouses(db: AsyncSession) -> list[Row]:
+    """
+    Warehouse picker for the accept-invitation form — every warehouse,
+    by name.
+
+    Returns plain rows with only the `WarehouseOut` columns — no ORM
+    instances or identity-map entries for a read-only listing.
+    """
+    stmt = select(
+        Warehouse.id,
+        Warehouse.name,
+        Warehouse.address,
+        Warehouse.capacity,
+        Warehouse.created_at,
+    ).order_by(Warehouse.name)
     result = await db.execute(stmt)
-    return result.scalars().all()
+    return list(result.all())
 
 
 # ── Forgot Password (OTP) ───────────────────────────────────────────
@@ -466,10 +560,10 @@ async def request_password_reset(email: str, db: AsyncSession) -> dict:
     if user is None or user.status != UserStatus.ACTIVE:
         return generic_response
 
+    now = datetime.now(timezone.utc)
+
     # ── Rate limit: max N requests per UTC day ───────────────────────
-    today_start = datetime.now(timezone.utc).replace(
-        hour=0, minute=0, second=0, microsecond=0,
-    )
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     count_stmt = (
         select(func.count())
         .select_from(PasswordResetOTP)
@@ -501,11 +595,10 @@ async def request_password_reset(email: str, db: AsyncSession) -> dict:
     # ── Create new OTP ───────────────────────────────────────────────
     otp_plain = _generate_otp()
     otp_record = PasswordResetOTP(
-        id=uuid.uuid4(),
         user_id=user.id,
         email=email,
         otp_hash=_hash_otp(otp_plain),
-        expires_at=datetime.now(timezone.utc) + timedelta(minutes=settings.OTP_EXPIRE_MINUTES),
+        expires_at=now + timedelta(minutes=settings.OTP_EXPIRE_MINUTES),
     )
     db.add(otp_record)
     await db.flush()
@@ -536,7 +629,7 @@ async def reset_password_with_otp(
         .where(
             PasswordResetOTP.email == email,
             PasswordResetOTP.is_used == False,  # noqa: E712
-            PasswordResetOTP.expires_at > datetime.now(timezone.utc),
+            PasswordResetOTP.expires_at > func.now(),
         )
         .order_by(PasswordResetOTP.created_at.desc())
         .limit(1)
@@ -544,7 +637,7 @@ async def reset_password_with_otp(
     result = await db.execute(stmt)
     otp_record = result.scalar_one_or_none()
 
-    if otp_record is None or otp_record.otp_hash != _hash_otp(otp):
+    if otp_record is None or not hmac.compare_digest(otp_record.otp_hash, _hash_otp(otp)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired OTP.",
@@ -560,7 +653,7 @@ async def reset_password_with_otp(
         )
 
     # ── Update password ──────────────────────────────────────────────
-    user.password_hash = hash_password(new_password)
+    user.password_hash = await hash_password_async(new_password)
     otp_record.is_used = True
 
     # ── Revoke all sessions ──────────────────────────────────────────
@@ -605,7 +698,7 @@ async def change_password(
             detail="User not found.",
         )
 
-    if not verify_password(current_password, user.password_hash or ""):
+    if not await verify_password_async(current_password, user.password_hash or ""):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect.",
@@ -618,7 +711,7 @@ async def change_password(
         )
 
     # ── Update password ──────────────────────────────────────────────
-    user.password_hash = hash_password(new_password)
+    user.password_hash = await hash_password_async(new_password)
 
     # ── Revoke all sessions ──────────────────────────────────────────
     revoked = await session_service.deactivate_all_user_sessions(user.id, db)
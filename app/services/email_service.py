@@ -3,8 +3,15 @@ Email service.
 
 Handles sending emails via SMTP using aiosmtplib for async support.
 Used by the invitation flow to notify invited users.
+
+Each worker keeps one authenticated SMTP connection, opened on first
+use and shared behind a lock (an SMTP session carries one transaction
+at a time), so a burst of emails pays the connect + STARTTLS + AUTH
+handshake once.  A connection the server has dropped is reopened and
+the send retried once.
 """
 
+import asyncio
 import logging
 from email.message import EmailMessage
 
@@ -14,9 +21,39 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+_client: aiosmtplib.SMTP | None = None
+_lock = asyncio.Lock()
+
+
+async def _connected_client() -> aiosmtplib.SMTP:
+    """Return the shared client, (re)connecting it if needed.  Caller holds ``_lock``."""
+    global _client
+    if _client is None or not _client.is_connected:
+        client = aiosmtplib.SMTP(
+            hostname=settings.EMAIL_HOST,
+            port=settings.EMAIL_PORT,
+            username=settings.SENDER_EMAIL,
+            password=settings.EMAIL_PASSWORD,
+            start_tls=True,
+        )
+        await client.connect()  # also runs STARTTLS + AUTH
+        _client = client
+    return _client
+
+
+async def close_smtp() -> None:
+    global _client
+    if _client is not None and _client.is_connected:
+        try:
+            await _client.quit()
+        except aiosmtplib.SMTPException:
+            _client.close()
+    _client = None
+
 
 async def send_email(to: str, subject: str, html_body: str) -> None:
     """Send an HTML email via the configured SMTP server."""
+    global _client
     message = EmailMessage()
     message["From"] = settings.SENDER_EMAIL
     message["To"] = to
@@ -24,14 +61,13 @@ async def send_email(to: str, subject: str, html_body: str) -> None:
     message.set_content(html_body, subtype="html")
 
     try:
-        await aiosmtplib.send(
-            message,
-            hostname=settings.EMAIL_HOST,
-            port=settings.EMAIL_PORT,
-            username=settings.SENDER_EMAIL,
-            password=settings.EMAIL_PASSWORD,
-            start_tls=True,
-        )
+        async with _lock:
+            try:
+                await (await _connected_client()).send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                # Idle connection timed out server-side — reconnect once.
+                _client = None
+                await (await _connected_client()).send_message(message)
         logger.info("Email sent to %s", to)
     except Exception:
         logger.exception("Failed to send email to %s", to)
@@ -10,20 +10,27 @@ import secrets
 import uuid
 from datetime import datetime, timedelta, timezone
 
-from fastapi import HTTPException, status
-from sqlalchemy import select
+from fastapi import BackgroundTasks, HTTPException, status
+from sqlalchemy import exists, select, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.security import digest_token
 from app.models.invitation import Invitation, InvitationStatus
-from app.models.user import User
+from app.models.user import User, UserStatus
 from app.services import audit_service
 from app.services.audit_serializer import to_audit_dict
 from app.services.email_service import send_invitation_email
 
 
 def _generate_invite_token() -> str:
-    """Cryptographically secure URL-safe token."""
-    return secrets.token_urlsafe(48)
+    """Cryptographically secure URL-safe token (256 bits)."""
+    return secrets.token_urlsafe(32)
+
+
+def _violated_constraint(exc: IntegrityError) -> str | None:
+    """Constraint named by the driver error (asyncpg) behind ``exc``."""
+    return getattr(exc.orig.__cause__, "constraint_name", None)
 
 
 async def create_invitation(
@@ -32,52 +39,54 @@ async def create_invitation(
     invited_by: uuid.UUID,
     db: AsyncSession,
     expires_in_hours: int = 72,
-) -> Invitation:
+    background_tasks: BackgroundTasks | None = None,
+) -> tuple[Invitation, str]:
     """
-    Create a new invitation.
+    Create a new invitation.  Returns it with the plain token, which is
+    never stored — only its digest is.
+
+    With ``background_tasks`` the email goes out after the response has
+    been sent — i.e. after the request's commit, and never for a request
+    that ends in an error.  Without it the email is sent inline.
 
     Business rules enforced:
     - Cannot invite an email that already has an ACTIVE user account.
     - Cannot create duplicate PENDING invitations for the same email.
     """
-    # Check for existing active user
-    existing_user = (
-        await db.execute(select(User).where(User.email == email))
-    ).scalar_one_or_none()
-
-    if existing_user and existing_user.status.value == "ACTIVE":
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="A user with this email already exists",
-        )
-
-    # Check for pending invitation
-    pending = (
-        await db.execute(
-            select(Invitation).where(
-                Invitation.email == email,
-                Invitation.status == InvitationStatus.PENDING,
-            )
+    # Check for existing active user — a boolean probe, no row hydrated.
+    active_user_exists = await db.scalar(
+        select(
+            exists().where(User.email == email, User.status == UserStatus.ACTIVE)
         )
-    ).scalar_one_or_none()
-
-    if pending:
+    )
+    if active_user_exists:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
-            detail="A pending invitation already exists for this email",
+            detail="A user with this email already exists",
         )
 
+    token = _generate_invite_token()
     invitation = Invitation(
-        id=uuid.uuid4(),
         email=email,
         invited_by=invited_by,
         role_assigned=role_assigned,
-        token=_generate_invite_token(),
+        token_hash=digest_token(token),
         expires_at=datetime.now(timezone.utc) + timedelta(hours=expires_in_hours),
         status=InvitationStatus.PENDING,
     )
-    db.add(invitation)
-    await db.flush()
+    # One PENDING invitation per email is enforced by the partial unique
+    # index — no pre-insert lookup.  The INSERT runs in a savepoint, so a
+    # conflict leaves the caller's transaction usable.
+    try:
+        async with db.begin_nested():
+            db.add(invitation)
+    except IntegrityError as exc:
+        if _violated_constraint(exc) != "ix_invitations_email_pending":
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A pending invitation already exists for this email",
+        ) from None
 
     await audit_service.log(
         db,
@@ -90,28 +99,44 @@ async def create_invitation(
     )
 
     # Send invitation email
-    await send_invitation_email(
-        to_email=email,
-        invitation_token=invitation.token,
-        role_assigned=role_assigned,
-    )
+    email_kwargs = {
+        "to_email": email,
+        "invitation_token": token,
+        "role_assigned": role_assigned,
+    }
+    if background_tasks is not None:
+        background_tasks.add_task(send_invitation_email, **email_kwargs)
+    else:
+        await send_invitation_email(**email_kwargs)
 
-    return invitation
+    return invitation, token
 
 
 async def list_invitations(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 50,
+    after: tuple[datetime, uuid.UUID] | None = None,
 ) -> list[Invitation]:
-    """List all invitations (admin only — enforced at controller)."""
-    stmt = select(Invitation).order_by(Invitation.created_at.desc()).offset(skip).limit(limit)
+    """
+    List all invitations, newest first (admin only — enforced at controller).
+
+    ``after`` is the ``(created_at, id)`` of the last row of the previous
+    page; when given, the page is found by an index seek instead of
+    skipping ``skip`` rows.
+    """
+    stmt = select(Invitation).order_by(Invitation.created_at.desc(), Invitation.id.desc())
+    if after is not None:
+        stmt = stmt.where(tuple_(Invitation.created_at, Invitation.id) < after)
+    else:
+        stmt = stmt.offset(skip)
+    stmt = stmt.limit(limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
 
 async def get_invitation_by_token(token: str, db: AsyncSession) -> Invitation:
-    stmt = select(Invitation).where(Invitation.token == token)
+    stmt = select(Invitation).where(Invitation.token_hash == digest_token(token))
     result = await db.execute(stmt)
     invite = result.scalar_one_or_none()
     if invite is None:
@@ -7,9 +7,11 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any
 
+import aiosmtplib
 from fastapi import HTTPException, status
 from sqlalchemy import and_, delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.models.client import Client
 from app.models.enums import MovementType
@@ -34,11 +36,10 @@ def _warehouse_code(warehouse: Warehouse) -> str:
 async def _next_sequence(
     category: ProductCategory,
     warehouse_id: uuid.UUID,
+    now: datetime,
     db: AsyncSession,
 ) -> int:
-    today_start = datetime.now(timezone.utc).replace(
-        hour=0, minute=0, second=0, microsecond=0,
-    )
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     stmt = (
         select(func.count())
         .select_from(Product)
@@ -59,8 +60,11 @@ async def _generate_sku(
 ) -> str:
     prefix = CATEGORY_PREFIX[category]
     wh_code = _warehouse_code(warehouse)
-    date_part = datetime.now(timezone.utc).strftime("%Y%m%d")
-    seq = await _next_sequence(category, warehouse.id, db)
+    # One clock read, so the date in the SKU and the day the sequence
+    # counts over can't straddle midnight.
+    now = datetime.now(timezone.utc)
+    date_part = now.strftime("%Y%m%d")
+    seq = await _next_sequence(category, warehouse.id, now, db)
     return f"{prefix}-{wh_code}-{date_part}-{seq:04d}"
 
 
@@ -109,7 +113,6 @@ async def create_product(
 
     sku_code = await _generate_sku(cat, warehouse, db)
     product = Product(
-        id=uuid.uuid4(),
         name=name,
         description=description,
         category=cat,
@@ -137,7 +140,9 @@ async def create_product(
 
 
 async def _load_client_for_email(email: str, db: AsyncSession) -> tuple[User | None, Client | None]:
-    user_result = await db.execute(select(User).where(User.email == email))
+    user_result = await db.execute(
+        select(User).options(selectinload(User.roles)).where(User.email == email)
+    )
     existing_user = user_result.scalar_one_or_none()
     if existing_user is None:
         return None, None
@@ -212,16 +217,15 @@ async def _bind_client_for_inward(
 
     invitation = None
     try:
-        invitation = await invitation_service.create_invitation(
+        invitation, _ = await invitation_service.create_invitation(
             email=email_norm,
             role_assigned="CLIENT",
             invited_by=operator_id,
             db=db,
         )
-    except HTTPException:
-        raise
-    except Exception:
-        # Temporary inward-flow bypass: never fail inward due to SMTP/email errors.
+    except (aiosmtplib.SMTPException, OSError):
+        # Temporary inward-flow bypass: never fail inward due to SMTP/email
+        # errors.  Database errors still propagate.
         invitation = None
     old_email = product.client_email
     product.client_email = email_norm
@@ -343,7 +347,6 @@ async def inward_product(
 
     now = datetime.now(timezone.utc)
     allocation = RackAllocation(
-        id=uuid.uuid4(),
         rack_id=rack_id,
         sku_id=product.id,
         allocated_by=operator_id,
@@ -355,7 +358,6 @@ async def inward_product(
     await db.flush()
 
     ledger_entry = InventoryLedger(
-        id=uuid.uuid4(),
         sku_id=product.id,
         warehouse_id=product.warehouse_id,
         movement_type=MovementType.INWARD,
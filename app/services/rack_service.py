@@ -46,7 +46,6 @@ async def create_rack(
         )
 
     rack = Rack(
-        id=uuid.uuid4(),
         label=label,
         room_id=room_id,
         capacity=capacity,
@@ -56,7 +56,6 @@ async def create_room(
         )
 
     room = Room(
-        id=uuid.uuid4(),
         name=name,
         warehouse_id=warehouse_id,
         temperature_zone_id=temperature_zone_id,
@@ -3,29 +3,61 @@ Session service — CRUD & lifecycle helpers for user sessions.
 
 Handles:
 - Querying active sessions (for concurrency checks)
+- Expiring a user's idle sessions (before those checks)
 - Deactivating single sessions (logout)
 - Deactivating all sessions for a user (force logout / disable)
 """
 
 import uuid
-from datetime import datetime, timezone
+from datetime import timedelta
 
-from sqlalchemy import select, update
+from sqlalchemy import bindparam, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
+from app.core import cache
 from app.models.session import UserSession
 
 
+# Built once at import and executed with bound parameters, so each call
+# skips statement construction and hits SQLAlchemy's compiled cache.
+# ``load_only`` limits hydration to the columns the auth flows read;
+# other attributes can still be assigned (and flushed) as usual.
+_active_sessions_stmt = (
+    select(UserSession)
+    .options(load_only(UserSession.device_id, UserSession.last_seen_at))
+    .where(
+        UserSession.user_id == bindparam("user_id"),
+        UserSession.is_active == True,  # noqa: E712
+    )
+)
+
+_active_session_by_id_stmt = (
+    select(UserSession)
+    .options(
+        load_only(
+            UserSession.user_id,
+            UserSession.device_id,
+            UserSession.refresh_token_hash,
+        )
+    )
+    .where(
+        UserSession.id == bindparam("session_id"),
+        UserSession.is_active == True,  # noqa: E712
+    )
+)
+
+
 async def get_active_sessions(
     user_id: uuid.UUID,
     db: AsyncSession,
 ) -> list[UserSession]:
-    """Return all active sessions for a user."""
-    stmt = select(UserSession).where(
-        UserSession.user_id == user_id,
-        UserSession.is_active == True,  # noqa: E712
-    )
-    result = await db.execute(stmt)
+    """
+    Return all active sessions for a user.
+
+    Only ``device_id`` and ``last_seen_at`` are loaded.
+    """
+    result = await db.execute(_active_sessions_stmt, {"user_id": user_id})
     return list(result.scalars().all())
 
 
@@ -33,13 +65,41 @@ async def get_active_session_by_id(
     session_id: uuid.UUID,
     db: AsyncSession,
 ) -> UserSession | None:
-    """Return a single active session by its primary key."""
-    stmt = select(UserSession).where(
-        UserSession.id == session_id,
-        UserSession.is_active == True,  # noqa: E712
+    """
+    Return a single active session by its primary key.
+
+    Only ``user_id``, ``device_id`` and ``refresh_token_hash`` are loaded.
+    """
+    result = await db.execute(_active_session_by_id_stmt, {"session_id": session_id})
+    return result.scalar_one_or_none()
+
+
+async def gc_stale_sessions(
+    user_id: uuid.UUID,
+    db: AsyncSession,
+    idle_timeout: timedelta,
+) -> int:
+    """
+    Deactivate the user's sessions idle for longer than ``idle_timeout``.
+
+    One UPDATE, with the cutoff computed by PostgreSQL.  Returns the
+    number of sessions expired.
+    """
+    stmt = (
+        update(UserSession)
+        .where(
+            UserSession.user_id == user_id,
+            UserSession.is_active == True,  # noqa: E712
+            UserSession.last_seen_at < func.now() - idle_timeout,
+        )
+        .values(is_active=False)
+        .returning(UserSession.id)
+        .execution_options(synchronize_session=False)
     )
     result = await db.execute(stmt)
-    return result.scalar_one_or_none()
+    expired = list(result.scalars().all())
+    cache.invalidate_on_commit(db, *(cache.session_key(sid) for sid in expired))
+    return len(expired)
 
 
 async def deactivate_session(
@@ -54,6 +114,7 @@ async def deactivate_session(
     )
     await db.execute(stmt)
     await db.flush()
+    cache.invalidate_on_commit(db, cache.session_key(session_id))
 
 
 async def deactivate_all_user_sessions(
@@ -73,7 +134,10 @@ async def deactivate_all_user_sessions(
             UserSession.is_active == True,  # noqa: E712
         )
         .values(is_active=False)
+        .returning(UserSession.id)
     )
     result = await db.execute(stmt)
+    revoked = list(result.scalars().all())
     await db.flush()
-    return result.rowcount
+    cache.invalidate_on_commit(db, *(cache.session_key(sid) for sid in revoked))
+    return len(revoked)
@@ -49,7 +49,6 @@ async def create_temperature_zone(
         )
 
     zone = TemperatureZone(
-        id=uuid.uuid4(),
         zone_name=trimmed,
         min_temp=min_dec,
         max_temp=max_dec,
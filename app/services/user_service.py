@@ -7,11 +7,12 @@ never see other clients.
 """
 
 import uuid
+from datetime import datetime
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
 from app.models.user import User, UserStatus
 from app.rbac.context_resolver import DataScope
@@ -19,16 +20,31 @@ from app.services import audit_service
 from app.services.audit_serializer import to_audit_dict
 
 
+async def _get_user_slim(user_id: uuid.UUID, db: AsyncSession) -> User:
+    """
+    Column-only fetch for mutation paths.
+
+    No relationship is loaded (they are all ``raise_on_sql``), so an
+    accidental access fails loudly instead of issuing a query.
+    """
+    user = await db.get(User, user_id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return user
+
+
 async def get_user_by_id(
     user_id: uuid.UUID,
     db: AsyncSession,
 ) -> User:
+    # The one-to-one profiles ride along as LEFT OUTER JOINs; only the
+    # to-many ``roles`` needs its own (IN) query.
     stmt = (
         select(User)
         .options(
             selectinload(User.roles),
-            selectinload(User.operator_profile),
-            selectinload(User.client),
+            joinedload(User.operator_profile),
+            joinedload(User.client),
         )
         .where(User.id == user_id)
     )
@@ -44,6 +60,7 @@ async def list_users(
     scope: DataScope,
     skip: int = 0,
     limit: int = 50,
+    after: tuple[datetime, uuid.UUID] | None = None,
 ) -> list[User]:
     """
     List users respecting data scope.
@@ -51,14 +68,14 @@ async def list_users(
     - Admin: sees all users.
     - Operator: sees users in the same warehouse.
     - Client: sees only themselves.
+
+    Only ``roles`` is loaded (one IN query for the whole page) — it's
+    all ``UserOut`` needs.  Newest first by ``(created_at, id)``;
+    ``after`` is that pair from the last row of the previous page
+    (keyset), otherwise ``skip`` rows are skipped.
     """
-    stmt = (
-        select(User)
-        .options(
-            selectinload(User.roles),
-            selectinload(User.operator_profile),
-            selectinload(User.client),
-        )
+    stmt = select(User).options(selectinload(User.roles)).order_by(
+        User.created_at.desc(), User.id.desc()
     )
 
     if scope.is_admin:
@@ -77,7 +94,11 @@ async def list_users(
         # Fallback — only see own record
         stmt = stmt.where(User.id == scope.user_id)
 
-    stmt = stmt.offset(skip).limit(limit)
+    if after is not None:
+        stmt = stmt.where(tuple_(User.created_at, User.id) < after)
+    else:
+        stmt = stmt.offset(skip)
+    stmt = stmt.limit(limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
@@ -90,7 +111,7 @@ async def disable_user(
     """Admin action — disable a user account and invalidate all sessions."""
     from app.services import session_service
 
-    user = await get_user_by_id(target_user_id, db)
+    user = await _get_user_slim(target_user_id, db)
     old_snapshot = to_audit_dict(user)
 
     user.status = UserStatus.DISABLED
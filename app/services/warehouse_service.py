@@ -8,9 +8,10 @@ All queries are scope-filtered:
 """
 
 import uuid
+from datetime import datetime
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.warehouse import Warehouse
@@ -28,7 +29,6 @@ async def create_warehouse(
 ) -> Warehouse:
     """Create a new warehouse (admin only — enforced at controller)."""
     warehouse = Warehouse(
-        id=uuid.uuid4(),
         name=name,
         address=address,
         capacity=capacity,
@@ -55,9 +55,15 @@ async def list_warehouses(
     scope: DataScope,
     skip: int = 0,
     limit: int = 50,
+    after: tuple[datetime, uuid.UUID] | None = None,
 ) -> list[Warehouse]:
-    """List warehouses — scoped by the caller's role."""
-    stmt = select(Warehouse)
+    """
+    List warehouses, newest first — scoped by the caller's role.
+
+    ``after`` is the ``(created_at, id)`` of the last row of the previous
+    page (keyset); otherwise ``skip`` rows are skipped.
+    """
+    stmt = select(Warehouse).order_by(Warehouse.created_at.desc(), Warehouse.id.desc())
 
     if scope.is_admin:
         pass  # no filter
@@ -68,7 +74,11 @@ async def list_warehouses(
         # Other roles: return empty or raise
         return []
 
-    stmt = stmt.offset(skip).limit(limit)
+    if after is not None:
+        stmt = stmt.where(tuple_(Warehouse.created_at, Warehouse.id) < after)
+    else:
+        stmt = stmt.offset(skip)
+    stmt = stmt.limit(limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 